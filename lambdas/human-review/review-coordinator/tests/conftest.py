@@ -0,0 +1,20 @@
+"""Shared fixtures for Review Coordinator tests."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Import once per session with AWS clients patched; test modules reuse the cached module,
+# so module-level clients such as secrets_client stay mocks for the whole run
+with patch('boto3.client'):
+    import lambda_function
+
+
+@pytest.fixture(scope="session")
+def lambda_module():
+    """The review coordinator module, imported once with AWS clients patched."""
+    return lambda_function
@@ -1,28 +1,120 @@
 """Tests for Review Coordinator Lambda."""
 
+import copy
 import pytest
 import json
-from unittest.mock import Mock, patch
-from datetime import datetime, timedelta
-
-# Mock AWS services before importing lambda function
-with patch('boto3.client'), patch('requests.get'), patch('requests.post'):
-    import sys
-    import os
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-    from lambda_function import (
-        lambda_handler,
-        GitHubReviewService,
-        evaluate_review_decision
+import responses
+import time_machine
+from types import MappingProxyType, SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from datetime import datetime
+
+# conftest.py imports lambda_function once with AWS clients patched
+from lambda_function import (
+    lambda_handler,
+    GitHubReviewService,
+    evaluate_review_decision
+)
+
+# Fixed timestamp for stubbed PR data, computed once at import
+_NOW_ISO = datetime.utcnow().isoformat()
+
+# Secrets Manager payload in the shape _get_github_token reads
+_SECRET_STRING = '{"token": "test-token"}'
+
+_GITHUB_API = 'https://api.github.com'
+
+
+_OPEN_PR = MappingProxyType({'state': 'open', 'mergeable': True, 'draft': False})
+
+
+def _open_pr(**overrides):
+    """Open, mergeable, non-draft PR status with overrides applied."""
+    return {**_OPEN_PR, **overrides}
+
+
+def _success_checks():
+    return [{'status': 'completed', 'conclusion': 'success'}]
+
+
+def _failing_checks(name='build'):
+    return [
+        {'status': 'completed', 'conclusion': 'failure', 'name': name},
+        {'status': 'completed', 'conclusion': 'success', 'name': 'lint'}
+    ]
+
+
+def _review(state):
+    return {'user': 'reviewer1', 'state': state, 'submitted_at': '2024-01-15T12:00:00Z'}
+
+
+def _evaluate_kwargs(enable_human_review=True, **auto_merge_conditions):
+    return {
+        'enable_human_review': enable_human_review,
+        'auto_merge_conditions': auto_merge_conditions,
+        'review_timeout_hours': 24
+    }
+
+
+# (pr_status, reviews, checks, evaluate kwargs, action, reason substring, comment substring)
+_EVALUATE_CASES = [
+    pytest.param(_open_pr(), [], _success_checks(),
+                 _evaluate_kwargs(enable_human_review=False, merge_method='squash'),
+                 'merge', 'auto-merging', None, id='auto_merge_disabled'),
+    pytest.param(_open_pr(draft=True), [], [], _evaluate_kwargs(),
+                 'wait', 'draft', None, id='draft_pr'),
+    pytest.param(_open_pr(mergeable=False), [], [], _evaluate_kwargs(),
+                 'request_changes', 'merge conflicts', 'resolved', id='merge_conflicts'),
+    pytest.param(_open_pr(), [], [{'status': 'in_progress', 'conclusion': None}], _evaluate_kwargs(),
+                 'wait', 'still running', None, id='checks_pending'),
+    pytest.param(_open_pr(), [], _failing_checks('build'), _evaluate_kwargs(),
+                 'request_changes', 'failing', 'build', id='checks_failing'),
+    pytest.param(_open_pr(), [_review('APPROVED')], _success_checks(),
+                 _evaluate_kwargs(min_approvals=1, merge_method='squash'),
+                 'merge', 'Approved', None, id='approved_review'),
+    pytest.param(_open_pr(), [_review('CHANGES_REQUESTED')], _success_checks(),
+                 _evaluate_kwargs(min_approvals=1),
+                 'wait', 'Changes requested', None, id='changes_requested'),
+    # PR created 26 hours before the frozen clock, with no reviews
+    pytest.param(_open_pr(created_at='2024-01-15T10:00:00Z'), [], _success_checks(),
+                 _evaluate_kwargs(min_approvals=1),
+                 'merge', 'timeout', None, id='timeout'),
+]
+
+
+def _make_github_stub():
+    """Stub exposing only the GitHubReviewService methods the handler calls."""
+    return SimpleNamespace(
+        get_pull_request_status=Mock(return_value={
+            'state': 'open',
+            'mergeable': True,
+            'mergeable_state': 'clean',
+            'draft': False,
+            'created_at': _NOW_ISO,
+            'updated_at': _NOW_ISO,
+            'head_sha': 'head-sha-123'
+        }),
+        get_pull_request_reviews=Mock(return_value=[]),
+        get_pull_request_checks=Mock(return_value=[
+            {
+                'id': 1,
+                'name': 'build',
+                'status': 'completed',
+                'conclusion': 'success'
+            }
+        ]),
+        merge_pull_request=Mock(),
+        add_pr_comment=Mock()
     )
 
 
 class TestReviewCoordinator:
     """Test cases for Review Coordinator Lambda."""
 
-    @pytest.fixture
-    def sample_event(self):
-        """Sample event data for testing."""
+    @pytest.fixture(scope="module")
+    def sample_event_template(self):
+        """Sample event data shared by the module; use sample_event for a mutable copy."""
         return {
             'project_context': {
                 'project_name': 'test-project',
@@ -51,6 +143,11 @@ class TestReviewCoordinator:
         }
 
     @pytest.fixture
+    def sample_event(self, sample_event_template):
+        """Per-test copy of the sample event, safe to mutate."""
+        return copy.deepcopy(sample_event_template)
+
+    @pytest.fixture(scope="module")
     def lambda_context(self):
         """Mock Lambda context."""
         context = Mock()
@@ -62,48 +159,39 @@ class TestReviewCoordinator:
     @pytest.fixture
     def mock_github_service(self):
         """Mock GitHub review service."""
-        service = Mock(spec=GitHubReviewService)
-        service.get_pull_request_status.return_value = {
-            'state': 'open',
-            'mergeable': True,
-            'mergeable_state': 'clean',
-            'draft': False,
-            'created_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
-        }
-        service.get_pull_request_reviews.return_value = []
-        service.get_pull_request_checks.return_value = [
-            {
-                'id': 1,
-                'name': 'build',
-                'status': 'completed',
-                'conclusion': 'success'
-            }
-        ]
-        return service
-
-    @patch.dict(os.environ, {
-        'COMPONENT_SPECS_TABLE': 'test-table',
-        'GITHUB_TOKEN_SECRET': 'test-secret'
-    })
-    @patch('lambda_function.DynamoDBService')
-    @patch('lambda_function.GitHubReviewService')
-    @patch('lambda_function.setup_logger')
-    @patch('lambda_function.log_lambda_start')
-    @patch('lambda_function.log_lambda_end')
-    def test_lambda_handler_success_auto_merge(self, mock_log_end, mock_log_start, mock_setup_logger,
-                                              mock_github_service_class, mock_dynamodb_service,
-                                              sample_event, lambda_context, mock_github_service):
+        return _make_github_stub()
+
+    @pytest.fixture
+    def github_service(self, mocker, lambda_module):
+        """GitHubReviewService built against a mocked Secrets Manager client."""
+        secrets_client = mocker.patch.object(lambda_module, 'secrets_client')
+        secrets_client.get_secret_value.return_value = {'SecretString': _SECRET_STRING}
+        # Fresh ETag cache per test so results don't depend on test order or xdist worker
+        mocker.patch.object(lambda_module, '_ETAG_CACHE', {})
+        return GitHubReviewService()
+
+    @pytest.fixture
+    def env(self, monkeypatch):
+        """Handler environment variables, set and restored through monkeypatch."""
+        monkeypatch.setenv('REVIEW_REQUESTS_TABLE', 'test-table')
+        monkeypatch.setenv('GITHUB_TOKEN_SECRET_ARN', 'test-secret')
+
+    @pytest.fixture
+    def patched_handler_env(self, env, mocker, lambda_module, mock_github_service):
+        """Patch the handler's AWS and GitHub dependencies in one place."""
+        resource = mocker.patch.object(lambda_module.boto3, 'resource')
+        table = resource.return_value.Table.return_value
+        table.query.return_value = {'Items': []}
+        
+        github_cls = mocker.patch.object(
+            lambda_module, 'GitHubReviewService', return_value=mock_github_service
+        )
+        return SimpleNamespace(github=mock_github_service, github_cls=github_cls, table=table)
+
+    def test_lambda_handler_success_auto_merge(self, patched_handler_env, sample_event, lambda_context):
         """Test successful lambda handler with auto-merge."""
-        # Setup mocks
-        mock_log_start.return_value = 'test-execution-id'
-        mock_setup_logger.return_value = Mock()
-        
-        mock_dynamodb_instance = Mock()
-        mock_dynamodb_service.return_value = mock_dynamodb_instance
-        
-        mock_github_service_class.return_value = mock_github_service
-        mock_github_service.merge_pull_request.return_value = {'sha': 'merge-commit-sha'}
+        github = patched_handler_env.github
+        github.merge_pull_request.return_value = {'sha': 'merge-commit-sha'}
         
         # Modify event for auto-merge scenario (no human review required)
         sample_event['execution_context']['review_config']['enable_human_review'] = False
@@ -112,299 +200,216 @@ class TestReviewCoordinator:
         result = lambda_handler(sample_event, lambda_context)
         
         # Verify
-        assert result['success'] is True
+        assert result['status'] == 'success'
         assert result['data']['pipeline_complete'] is True
         assert 'merged' in result['data']['action_summary']
         
         # Verify GitHub service calls
-        mock_github_service.get_pull_request_status.assert_called_once()
-        mock_github_service.merge_pull_request.assert_called_once()
-
-    @patch.dict(os.environ, {
-        'COMPONENT_SPECS_TABLE': 'test-table',
-        'GITHUB_TOKEN_SECRET': 'test-secret'
-    })
-    @patch('lambda_function.DynamoDBService')
-    @patch('lambda_function.GitHubReviewService')
-    @patch('lambda_function.setup_logger')
-    @patch('lambda_function.log_lambda_start')
-    @patch('lambda_function.log_lambda_end')
-    def test_lambda_handler_waiting_for_review(self, mock_log_end, mock_log_start, mock_setup_logger,
-                                             mock_github_service_class, mock_dynamodb_service,
-                                             sample_event, lambda_context, mock_github_service):
+        github.get_pull_request_status.assert_called_once()
+        github.merge_pull_request.assert_called_once()
+
+    def test_lambda_handler_waiting_for_review(self, patched_handler_env, sample_event, lambda_context):
         """Test lambda handler waiting for human review."""
-        # Setup mocks
-        mock_log_start.return_value = 'test-execution-id'
-        mock_setup_logger.return_value = Mock()
-        
-        mock_dynamodb_instance = Mock()
-        mock_dynamodb_service.return_value = mock_dynamodb_instance
-        
-        mock_github_service_class.return_value = mock_github_service
         # No reviews yet
-        mock_github_service.get_pull_request_reviews.return_value = []
+        patched_handler_env.github.get_pull_request_reviews.return_value = []
         
         # Execute
         result = lambda_handler(sample_event, lambda_context)
         
         # Verify
-        assert result['success'] is True
+        assert result['status'] == 'success'
         assert result['data']['pipeline_complete'] is False
         assert result['data']['next_stage'] == 'review-monitor'
         assert 'waiting' in result['data']['action_summary']
 
-    @patch('lambda_function.secrets_client')
-    def test_github_service_initialization(self, mock_secrets_client):
-        """Test GitHub review service initialization."""
-        mock_secrets_client.get_secret_value.return_value = {
-            'SecretString': json.dumps({'github_token': 'test-token'})
+    def test_lambda_handler_already_merged(self, patched_handler_env, sample_event, lambda_context):
+        """Test retried invocation returns the recorded merge without calling GitHub."""
+        recorded = {
+            'review_decision': {'action': 'merge', 'reason': 'All conditions met'},
+            'action_taken': {'action': 'merged', 'merge_sha': 'merge-commit-sha'}
+        }
+        patched_handler_env.table.query.return_value = {
+            'Items': [{'review_coordination': json.dumps(recorded)}]
         }
-        
-        service = GitHubReviewService()
-        
-        assert service.token == 'test-token'
-        assert 'Bearer test-token' in service.headers['Authorization']
 
-    @patch('lambda_function.requests.get')
-    @patch('lambda_function.secrets_client')
-    def test_get_pull_request_status(self, mock_secrets_client, mock_get):
+        result = lambda_handler(sample_event, lambda_context)
+
+        assert result['status'] == 'success'
+        assert result['data']['pipeline_complete'] is True
+        assert result['data']['review_coordination']['action_taken']['merge_sha'] == 'merge-commit-sha'
+        patched_handler_env.github_cls.assert_not_called()
+
+    def test_github_service_initialization(self, github_service):
+        """Test GitHub review service initialization."""
+        assert github_service.token == 'test-token'
+        assert 'Bearer test-token' in github_service.headers['Authorization']
+
+    @responses.activate
+    def test_get_pull_request_status(self, github_service):
         """Test getting pull request status."""
-        mock_secrets_client.get_secret_value.return_value = {
-            'SecretString': json.dumps({'github_token': 'test-token'})
-        }
-        
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.json.return_value = {
-            'state': 'open',
-            'mergeable': True,
-            'mergeable_state': 'clean',
-            'draft': False,
-            'created_at': '2024-01-15T10:00:00Z',
-            'updated_at': '2024-01-15T11:00:00Z'
-        }
+        responses.get(
+            f"{_GITHUB_API}/repos/test-owner/test-repo/pulls/1",
+            json={
+                'state': 'open',
+                'mergeable': True,
+                'mergeable_state': 'clean',
+                'draft': False,
+                'created_at': '2024-01-15T10:00:00Z',
+                'updated_at': '2024-01-15T11:00:00Z',
+                'head': {'sha': 'head-sha-123'}
+            }
+        )
         
-        service = GitHubReviewService()
-        status = service.get_pull_request_status('test-owner/test-repo', 1)
+        status = github_service.get_pull_request_status('test-owner/test-repo', 1)
         
         assert status['state'] == 'open'
         assert status['mergeable'] is True
         assert status['draft'] is False
+        assert status['head_sha'] == 'head-sha-123'
 
-    @patch('lambda_function.requests.get')
-    @patch('lambda_function.secrets_client')
-    def test_get_pull_request_reviews(self, mock_secrets_client, mock_get):
+    @responses.activate
+    def test_get_pull_request_reviews(self, github_service):
         """Test getting pull request reviews."""
-        mock_secrets_client.get_secret_value.return_value = {
-            'SecretString': json.dumps({'github_token': 'test-token'})
-        }
-        
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.json.return_value = [
-            {
-                'id': 1,
-                'user': {'login': 'reviewer1'},
-                'state': 'APPROVED',
-                'submitted_at': '2024-01-15T12:00:00Z',
-                'body': 'Looks good!'
-            },
-            {
-                'id': 2,
-                'user': {'login': 'reviewer2'},
-                'state': 'CHANGES_REQUESTED',
-                'submitted_at': '2024-01-15T13:00:00Z',
-                'body': 'Please fix the bug'
-            }
-        ]
+        responses.get(
+            f"{_GITHUB_API}/repos/test-owner/test-repo/pulls/1/reviews",
+            json=[
+                {
+                    'id': 1,
+                    'user': {'login': 'reviewer1'},
+                    'state': 'APPROVED',
+                    'submitted_at': '2024-01-15T12:00:00Z',
+                    'body': 'Looks good!'
+                },
+                {
+                    'id': 2,
+                    'user': {'login': 'reviewer2'},
+                    'state': 'CHANGES_REQUESTED',
+                    'submitted_at': '2024-01-15T13:00:00Z',
+                    'body': 'Please fix the bug'
+                }
+            ]
+        )
         
-        service = GitHubReviewService()
-        reviews = service.get_pull_request_reviews('test-owner/test-repo', 1)
+        reviews = github_service.get_pull_request_reviews('test-owner/test-repo', 1)
         
         assert len(reviews) == 2
         assert reviews[0]['state'] == 'APPROVED'
         assert reviews[1]['state'] == 'CHANGES_REQUESTED'
 
-    @patch('lambda_function.requests.put')
-    @patch('lambda_function.secrets_client')
-    def test_merge_pull_request(self, mock_secrets_client, mock_put):
+    @responses.activate
+    def test_get_pull_request_reviews_not_modified(self, github_service):
+        """Test that a 304 response reuses the cached ETag snapshot."""
+        url = f"{_GITHUB_API}/repos/test-owner/etag-repo/pulls/7/reviews"
+        responses.get(
+            url,
+            json=[
+                {
+                    'id': 1,
+                    'user': {'login': 'reviewer1'},
+                    'state': 'APPROVED',
+                    'submitted_at': '2024-01-15T12:00:00Z',
+                    'body': 'Looks good!'
+                }
+            ],
+            headers={'ETag': '"abc123"'}
+        )
+        responses.get(url, status=304)
+
+        github_service.get_pull_request_reviews('test-owner/etag-repo', 7)
+        reviews = github_service.get_pull_request_reviews('test-owner/etag-repo', 7)
+
+        assert reviews[0]['state'] == 'APPROVED'
+        assert responses.calls[1].request.headers['If-None-Match'] == '"abc123"'
+
+    @responses.activate
+    def test_etag_snapshot_persisted_only_when_changed(self, mocker, lambda_module, github_service):
+        """Test that an unchanged ETag skips the DynamoDB write and the warm cache stays bounded."""
+        mocker.patch.object(lambda_module, '_ETAG_CACHE_MAX_ENTRIES', 2)
+        executor = mocker.patch.object(lambda_module, '_BG_EXECUTOR', ThreadPoolExecutor(max_workers=1))
+        github_service.cache_table = Mock()
+        github_service.cache_table.query.return_value = {'Items': []}
+        url = f"{_GITHUB_API}/repos/test-owner/etag-repo/pulls/8/reviews"
+        responses.get(url, json=[], headers={'ETag': '"v1"'})
+
+        github_service.get_pull_request_reviews('test-owner/etag-repo', 8)
+        github_service.get_pull_request_reviews('test-owner/etag-repo', 8)
+        executor.shutdown(wait=True)
+
+        github_service.cache_table.put_item.assert_called_once()
+        for pr_number in (9, 10):
+            lambda_module._remember_snapshot(f"cache-{pr_number}", {'etag': '"x"', 'body': []})
+        assert list(lambda_module._ETAG_CACHE) == ['cache-9', 'cache-10']
+
+    @responses.activate
+    def test_merge_pull_request(self, github_service):
         """Test merging pull request."""
-        mock_secrets_client.get_secret_value.return_value = {
-            'SecretString': json.dumps({'github_token': 'test-token'})
-        }
-        
-        mock_put.return_value.status_code = 200
-        mock_put.return_value.json.return_value = {
-            'sha': 'merge-commit-sha',
-            'merged': True,
-            'message': 'Pull Request successfully merged'
-        }
+        responses.put(
+            f"{_GITHUB_API}/repos/test-owner/test-repo/pulls/1/merge",
+            json={
+                'sha': 'merge-commit-sha',
+                'merged': True,
+                'message': 'Pull Request successfully merged'
+            }
+        )
         
-        service = GitHubReviewService()
-        result = service.merge_pull_request('test-owner/test-repo', 1)
+        result = github_service.merge_pull_request('test-owner/test-repo', 1)
         
         assert result['merged'] is True
         assert 'sha' in result
 
-    def test_evaluate_review_decision_auto_merge_disabled(self):
-        """Test review decision evaluation with human review disabled."""
-        pr_status = {'state': 'open', 'mergeable': True, 'draft': False}
-        pr_reviews = []
-        pr_checks = [{'status': 'completed', 'conclusion': 'success'}]
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=False,
-            auto_merge_conditions={'merge_method': 'squash'},
-            review_timeout_hours=24
+    @responses.activate
+    def test_merge_pull_request_already_merged(self, github_service):
+        """Test a refused merge of a PR that an earlier attempt already merged counts as merged."""
+        responses.put(
+            f"{_GITHUB_API}/repos/test-owner/test-repo/pulls/2/merge",
+            status=405,
+            json={'message': 'Pull Request is not mergeable'}
         )
-        
-        assert decision['action'] == 'merge'
-        assert decision['merge_method'] == 'squash'
-        assert 'auto-merging' in decision['reason']
-
-    def test_evaluate_review_decision_draft_pr(self):
-        """Test review decision for draft PR."""
-        pr_status = {'state': 'open', 'mergeable': True, 'draft': True}
-        pr_reviews = []
-        pr_checks = []
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=True,
-            auto_merge_conditions={},
-            review_timeout_hours=24
+        responses.get(
+            f"{_GITHUB_API}/repos/test-owner/test-repo/pulls/2",
+            json={'state': 'closed', 'merged': True, 'merge_commit_sha': 'merge-commit-sha'}
         )
-        
-        assert decision['action'] == 'wait'
-        assert 'draft' in decision['reason']
-
-    def test_evaluate_review_decision_merge_conflicts(self):
-        """Test review decision with merge conflicts."""
-        pr_status = {'state': 'open', 'mergeable': False, 'draft': False}
-        pr_reviews = []
-        pr_checks = []
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=True,
-            auto_merge_conditions={},
-            review_timeout_hours=24
-        )
-        
-        assert decision['action'] == 'request_changes'
-        assert 'merge conflicts' in decision['reason']
-        assert 'comment' in decision
-
-    def test_evaluate_review_decision_checks_pending(self):
-        """Test review decision with pending checks."""
-        pr_status = {'state': 'open', 'mergeable': True, 'draft': False}
-        pr_reviews = []
-        pr_checks = [{'status': 'in_progress', 'conclusion': None}]
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=True,
-            auto_merge_conditions={},
-            review_timeout_hours=24
-        )
-        
-        assert decision['action'] == 'wait'
-        assert 'still running' in decision['reason']
-
-    def test_evaluate_review_decision_checks_failing(self):
-        """Test review decision with failing checks."""
-        pr_status = {'state': 'open', 'mergeable': True, 'draft': False}
-        pr_reviews = []
-        pr_checks = [
-            {'status': 'completed', 'conclusion': 'failure', 'name': 'build'},
-            {'status': 'completed', 'conclusion': 'success', 'name': 'lint'}
-        ]
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=True,
-            auto_merge_conditions={},
-            review_timeout_hours=24
-        )
-        
-        assert decision['action'] == 'request_changes'
-        assert 'failing' in decision['reason']
-        assert 'build' in decision['comment']
-
-    def test_evaluate_review_decision_approved_review(self):
-        """Test review decision with sufficient approvals."""
-        pr_status = {'state': 'open', 'mergeable': True, 'draft': False}
-        pr_reviews = [
-            {
-                'user': 'reviewer1',
-                'state': 'APPROVED',
-                'submitted_at': '2024-01-15T12:00:00Z'
-            }
-        ]
-        pr_checks = [{'status': 'completed', 'conclusion': 'success'}]
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=True,
-            auto_merge_conditions={'min_approvals': 1, 'merge_method': 'squash'},
-            review_timeout_hours=24
-        )
-        
-        assert decision['action'] == 'merge'
-        assert decision['merge_method'] == 'squash'
-        assert 'Approved' in decision['reason']
-
-    def test_evaluate_review_decision_changes_requested(self):
-        """Test review decision with changes requested."""
-        pr_status = {'state': 'open', 'mergeable': True, 'draft': False}
-        pr_reviews = [
-            {
-                'user': 'reviewer1',
-                'state': 'CHANGES_REQUESTED',
-                'submitted_at': '2024-01-15T12:00:00Z'
-            }
-        ]
-        pr_checks = [{'status': 'completed', 'conclusion': 'success'}]
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=True,
-            auto_merge_conditions={'min_approvals': 1},
-            review_timeout_hours=24
+
+        result = github_service.merge_pull_request('test-owner/test-repo', 2)
+
+        assert result['merged'] is True
+        assert result['sha'] == 'merge-commit-sha'
+
+    @responses.activate
+    def test_merge_pull_request_failure(self, github_service):
+        """Test a refused merge of an unmerged PR still raises."""
+        responses.put(
+            f"{_GITHUB_API}/repos/test-owner/test-repo/pulls/3/merge",
+            status=405,
+            json={'message': 'Pull Request is not mergeable'}
         )
-        
-        assert decision['action'] == 'wait'
-        assert 'Changes requested' in decision['reason']
-
-    def test_evaluate_review_decision_timeout(self):
-        """Test review decision with timeout."""
-        # PR created 25 hours ago
-        created_time = datetime.utcnow() - timedelta(hours=25)
-        pr_status = {
-            'state': 'open',
-            'mergeable': True,
-            'draft': False,
-            'created_at': created_time.isoformat() + 'Z'
-        }
-        pr_reviews = []  # No reviews
-        pr_checks = [{'status': 'completed', 'conclusion': 'success'}]
-        
-        decision = evaluate_review_decision(
-            pr_status, pr_reviews, pr_checks,
-            enable_human_review=True,
-            auto_merge_conditions={'min_approvals': 1},
-            review_timeout_hours=24
+        responses.get(
+            f"{_GITHUB_API}/repos/test-owner/test-repo/pulls/3",
+            json={'state': 'open', 'merged': False}
         )
-        
-        assert decision['action'] == 'merge'
-        assert 'timeout' in decision['reason']
-
-    @patch.dict(os.environ, {'COMPONENT_SPECS_TABLE': 'test-table'})
-    @patch('lambda_function.setup_logger')
-    @patch('lambda_function.log_lambda_start')
-    def test_lambda_handler_missing_context(self, mock_log_start, mock_setup_logger, lambda_context):
-        """Test lambda handler with missing required context."""
-        mock_log_start.return_value = 'test-execution-id'
-        mock_setup_logger.return_value = Mock()
+
+        with pytest.raises(Exception, match='Failed to merge PR'):
+            github_service.merge_pull_request('test-owner/test-repo', 3)
+
+    @pytest.mark.parametrize(
+        'pr_status,reviews,checks,kwargs,action,reason_sub,comment_sub', _EVALUATE_CASES
+    )
+    @time_machine.travel("2024-01-16T12:00:00Z", tick=False)
+    def test_evaluate_review_decision(self, pr_status, reviews, checks, kwargs,
+                                      action, reason_sub, comment_sub):
+        """Test review decision evaluation across PR, review and check states."""
+        decision = evaluate_review_decision(pr_status, reviews, checks, **kwargs)
+        
+        assert decision['action'] == action
+        assert reason_sub in decision['reason']
+        if comment_sub is not None:
+            assert comment_sub in decision['comment']
+        if action == 'merge':
+            assert decision['merge_method'] == kwargs['auto_merge_conditions'].get('merge_method', 'merge')
+
+    def test_lambda_handler_missing_context(self, mocker, env, lambda_module, lambda_context):
+        """Test lambda handler skips review coordination without GitHub integration data."""
+        resource = mocker.patch.object(lambda_module.boto3, 'resource')
         
         # Missing github_integration
         event = {
@@ -416,8 +421,10 @@ class TestReviewCoordinator:
         
         result = lambda_handler(event, lambda_context)
         
-        assert result['success'] is False
-        assert 'Missing required context' in result['error']
+        assert result['status'] == 'success'
+        assert result['requiresReview'] == 'false'
+        assert result['data']['review_coordination']['action_taken']['action'] == 'skipped'
+        resource.assert_not_called()
 
 
 if __name__ == '__main__':
@@ -11,65 +11,272 @@ Version: 1.0.0 (Simplified)
 import json
 import os
 import sys
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from datetime import datetime
 import base64
+import functools
+import io
+import string
+import tarfile
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 
-# Fix Python path to include layer directory
+# Fix Python path to include layer directory; PyNaCl is imported from it only when secrets are encrypted
 if '/opt/python' not in sys.path:
     sys.path.insert(0, '/opt/python')
 
-# Import PyNaCl from layer
+# orjson is optional - fall back to stdlib JSON when it is not packaged
 try:
-    from nacl import encoding, public
-    PYNACL_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    PYNACL_AVAILABLE = False
-    print("Warning: PyNaCl not available, GitHub secrets encryption will fail")
+    ORJSON_AVAILABLE = False
+
+# Concurrent S3 reads when hydrating generated files; boto3 clients are thread-safe
+_S3_FETCH_WORKERS = 16
+
+# Read size when streaming S3 bodies into base64 (a multiple of 3 keeps chunks aligned)
+_S3_STREAM_CHUNK_SIZE = 3 * 21845
+
+# Pool sized to the S3 fan-out (the default 10 would discard and re-handshake connections);
+# keepalive holds connections open across warm invocations
+_AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=_S3_FETCH_WORKERS,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Upper bound on concurrent GitHub API connections per service
+_GITHUB_POOL_SIZE = 32
+
+# Concurrent blob uploads per commit batch; stays under the pool size and GitHub's secondary rate limits
+_BLOB_UPLOAD_WORKERS = 16
+
+# Per-batch cap on individually logged blob failures; the rest are only counted
+_BLOB_FAILURES_LOGGED = 5
+
+# Largest base64 payload sent as one GraphQL createCommitOnBranch; GitHub caps request bodies near 40MB
+_GRAPHQL_COMMIT_MAX_BYTES = 32 * 1024 * 1024
+
+# GitHub and Netlify tokens from Secrets Manager, kept for the life of the execution environment
+_GITHUB_TOKEN_CACHE: Optional[str] = None
+_NETLIFY_TOKEN_CACHE: Optional[str] = None
+
+# GitHub API session, created on first use and kept for the life of the execution environment
+_GITHUB_SESSION = None
+
+# {url: (etag, json body)} for conditional GETs; GitHub doesn't charge rate limit for 304 responses
+_GITHUB_ETAG_CACHE: Dict[str, Tuple[str, Any]] = {}
+_GITHUB_ETAG_CACHE_MAX_ENTRIES = 256
+
+# Full integration records go to S3; the DynamoDB item keeps only pointers to them
+_INTEGRATIONS_BUCKET = os.environ.get('PROCESSED_BUCKET_NAME', 'ai-pipeline-v2-processed-008537862626-us-east-1')
+
+# Dump the whole incoming event; Step Functions payloads can run to hundreds of KB
+_LOG_FULL_EVENT = os.environ.get('LOG_FULL_EVENT') == '1'
+
+# Log every candidate source when resolving project_id
+_DEBUG_PROJECT_ID = bool(os.environ.get('DEBUG_PROJECT_ID'))
+
+# Seconds between workflow-run polls: start short, grow by the factor, never exceed the cap
+_WORKFLOW_POLL_INITIAL = 2.0
+_WORKFLOW_POLL_FACTOR = 1.5
+_WORKFLOW_POLL_MAX = 15.0
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
-secrets_client = boto3.client('secretsmanager')
+s3_client = boto3.client('s3', config=_AWS_CLIENT_CONFIG)
+secrets_client = boto3.client('secretsmanager', config=_AWS_CLIENT_CONFIG)
+dynamodb = boto3.resource('dynamodb', config=_AWS_CLIENT_CONFIG)
+integrations_table = dynamodb.Table(os.environ.get('GITHUB_INTEGRATIONS_TABLE', 'ai-pipeline-v2-github-integrations-dev'))
+
+# Parameters & Secrets Lambda Extension: cached secret reads over localhost,
+# with secrets_client as the fallback when the extension layer isn't attached
+_SECRETS_EXTENSION_URL = (
+    f"http://localhost:{os.environ.get('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT', '2773')}"
+    "/secretsmanager/get"
+)
+_SECRETS_EXTENSION_TIMEOUT = 1.0
+
+def _get_secret_string(secret_name: str) -> str:
+    """Read a secret string via the Parameters & Secrets extension, falling back to Secrets Manager."""
+    session_token = os.environ.get('AWS_SESSION_TOKEN')
+    # The extension only runs inside the Lambda execution environment
+    if session_token and os.environ.get('AWS_LAMBDA_RUNTIME_API'):
+        try:
+            import requests
+            response = requests.get(
+                _SECRETS_EXTENSION_URL,
+                params={'secretId': secret_name},
+                headers={'X-Aws-Parameters-Secrets-Token': session_token},
+                timeout=_SECRETS_EXTENSION_TIMEOUT
+            )
+            if response.status_code == 200:
+                return response.json()['SecretString']
+            print(f"Warning: Secrets extension returned {response.status_code} - falling back to Secrets Manager")
+        except Exception as e:
+            print(f"Warning: Secrets extension unavailable: {e} - falling back to Secrets Manager")
+    
+    response = secrets_client.get_secret_value(SecretId=secret_name)
+    return response['SecretString']
+
+def _get_github_session():
+    """Return the shared GitHub API session, building it on first use."""
+    global _GITHUB_SESSION
+    if _GITHUB_SESSION is None:
+        # Deferred so runs that fail validation never pay the requests/urllib3 import on cold start
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=_GITHUB_POOL_SIZE,
+            # Retry transient gateway errors on idempotent calls; hand back the last response when exhausted
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+        ))
+        _GITHUB_SESSION = session
+    return _GITHUB_SESSION
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize a request payload to UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _response_json(response) -> Any:
+    """Parse a requests response body as JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _b64encode_chunks(chunks) -> str:
+    """Base64-encode a stream of byte chunks without joining the raw bytes first."""
+    encoded = io.BytesIO()
+    carry = b''
+    for chunk in chunks:
+        data = carry + chunk if carry else chunk
+        # Encode whole 3-byte groups only, so the pieces concatenate into valid base64
+        cut = len(data) - len(data) % 3
+        encoded.write(base64.b64encode(data[:cut]))
+        carry = data[cut:]
+    encoded.write(base64.b64encode(carry))
+    return encoded.getvalue().decode('ascii')
+
+def _file_content_b64(file_info: Dict[str, Any]) -> str:
+    """Base64 content of a file to commit, '' when empty; S3-backed files arrive pre-encoded, inline ones as text or bytes."""
+    content_b64 = file_info.get('content_b64')
+    if content_b64 is not None:
+        return content_b64
+    
+    content = file_info.get('content') or b''
+    raw = content if isinstance(content, (bytes, bytearray)) else content.encode('utf-8')
+    # Empty files are skipped by the callers, so don't run them through the encoder
+    if not raw:
+        return ''
+    return base64.b64encode(raw).decode('ascii')
+
+def _encode_commit_file(file_info: Dict[str, Any]) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+    """Return ((path, base64), None) for one file to commit, or (None, reason) when it can't be encoded."""
+    try:
+        return (file_info['file_path'], _file_content_b64(file_info)), None
+    except Exception as e:
+        return None, f"{file_info.get('file_path', '<no file_path>')}: {str(e)}"
+
+def _log_failed_files(failures: List[str]):
+    """Log a batch's per-file failures, the first _BLOB_FAILURES_LOGGED individually."""
+    for problem in failures[:_BLOB_FAILURES_LOGGED]:
+        print(f"  Failed file {problem}")
+
+def _retrieve_file_from_s3(file_metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Retrieve one file's content from S3, or None if the read fails."""
+    try:
+        response = s3_client.get_object(Bucket=file_metadata['s3_bucket'], Key=file_metadata['s3_key'])
+        
+        # Streamed straight into the blob payload's base64; the raw object is never held whole
+        file_with_content = {
+            **file_metadata,
+            'content_b64': _b64encode_chunks(response['Body'].iter_chunks(_S3_STREAM_CHUNK_SIZE))
+        }
+        
+        print(f"Retrieved {file_metadata['file_path']} from S3")
+        return file_with_content
+    except Exception as e:
+        print(f"Error retrieving {file_metadata.get('file_path', 'unknown')} from S3: {e}")
+        return None
+
+def _read_files_archive(s3_bucket: str, s3_key: str) -> Dict[str, str]:
+    """Stream a packed .tar.gz of generated files from S3 into {file_path: base64 content}; empty on failure."""
+    contents = {}
+    try:
+        response = s3_client.get_object(Bucket=s3_bucket, Key=s3_key)
+        with tarfile.open(fileobj=response['Body'], mode='r|gz') as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                path = member.name[2:] if member.name.startswith('./') else member.name
+                member_file = archive.extractfile(member)
+                contents[path] = _b64encode_chunks(iter(lambda: member_file.read(_S3_STREAM_CHUNK_SIZE), b''))
+        print(f"Retrieved {len(contents)} files from archive s3://{s3_bucket}/{s3_key}")
+    except Exception as e:
+        print(f"Warning: Could not read files archive s3://{s3_bucket}/{s3_key}, fetching files individually: {e}")
+    return contents
 
-def retrieve_files_from_s3(generated_files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def retrieve_files_from_s3(generated_files: List[Dict[str, Any]], archive_key: Optional[str] = None,
+                           archive_bucket: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Retrieve file content from S3 for files that need to be committed to GitHub.
     
+    When the upstream stage packed the files into one archive, a single GET
+    serves them all; anything missing from it, or every file when there is
+    no archive, is read individually and concurrently.
+    
     Args:
         generated_files: List of file metadata with S3 references
+        archive_key: Optional S3 key of a .tar.gz holding the files by file_path
+        archive_bucket: Bucket of the archive; defaults to the files' own bucket
         
     Returns:
-        List of files with content included
+        List of files with content included, as base64 'content_b64' for S3-backed files
     """
     files_with_content = []
+    futures = []
+    
+    archived = {}
+    if archive_key:
+        archive_bucket = archive_bucket or next(
+            (f['s3_bucket'] for f in generated_files if f.get('s3_bucket')), None
+        )
+        if archive_bucket:
+            archived = _read_files_archive(archive_bucket, archive_key)
     
-    for file_metadata in generated_files:
-        s3_bucket = file_metadata.get('s3_bucket')
-        s3_key = file_metadata.get('s3_key')
+    with ThreadPoolExecutor(max_workers=_S3_FETCH_WORKERS) as executor:
+        # Common case: no archive and every file is an S3 reference, so map without per-file routing
+        if not archived and all(f.get('s3_bucket') and f.get('s3_key') for f in generated_files):
+            return [f for f in executor.map(_retrieve_file_from_s3, generated_files) if f is not None]
         
-        if s3_bucket and s3_key:
-            try:
-                # Retrieve content from S3
-                response = s3_client.get_object(Bucket=s3_bucket, Key=s3_key)
-                content = response['Body'].read().decode('utf-8')
-                
-                # Create file dict with content
-                file_with_content = file_metadata.copy()
-                file_with_content['content'] = content
+        for file_metadata in generated_files:
+            if file_metadata.get('file_path') in archived:
+                files_with_content.append({**file_metadata, 'content_b64': archived[file_metadata['file_path']]})
+            elif file_metadata.get('s3_bucket') and file_metadata.get('s3_key'):
+                futures.append(executor.submit(_retrieve_file_from_s3, file_metadata))
+            elif 'content' in file_metadata:
+                # File already has content (backward compatibility)
+                files_with_content.append(file_metadata)
+            else:
+                print(f"Warning: No content or S3 reference for {file_metadata.get('file_path', 'unknown')}")
+        
+        # Collect in submission order so the commit lists files deterministically
+        for future in futures:
+            file_with_content = future.result()
+            if file_with_content is not None:
                 files_with_content.append(file_with_content)
-                
-                print(f"Retrieved {file_metadata['file_path']} from S3")
-            except Exception as e:
-                print(f"Error retrieving {file_metadata.get('file_path', 'unknown')} from S3: {e}")
-        elif 'content' in file_metadata:
-            # File already has content (backward compatibility)
-            files_with_content.append(file_metadata)
-        else:
-            print(f"Warning: No content or S3 reference for {file_metadata.get('file_path', 'unknown')}")
     
     return files_with_content
 
@@ -84,11 +291,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict containing GitHub repository information and build status
     """
-    execution_id = f"github_orch_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
+    # Parts kept separately so the branch name reuses them without re-parsing execution_id
+    run_date, run_time = datetime.utcnow().strftime('%Y%m%d %H%M%S').split()
+    run_suffix = os.urandom(4).hex()
+    execution_id = f"github_orch_{run_date}_{run_time}_{run_suffix}"
     
     try:
         print(f"Starting GitHub orchestration with execution_id: {execution_id}")
-        print(f"Event data: {json.dumps(event, default=str)}")
+        if _LOG_FULL_EVENT:
+            print(f"Event data: {json.dumps(event, default=str)}")
+        else:
+            project_hint = event.get('project_id') or (event.get('project_metadata') or {}).get('project_name')
+            print(f"Event keys: {list(event.keys())}, project hint: {project_hint}")
         
         # Initialize variables early to avoid undefined errors in exception handler
         generated_files = []
@@ -177,23 +391,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             validation_passed = validation_summary.get('validation_passed', True)  # Default to True
             validation_data = {}
         
-        # Extract project_id from multiple possible sources with detailed logging
-        print(f"Searching for project_id...")
-        print(f"  - pipeline_context.project_id: {pipeline_context.get('project_id')}")
-        print(f"  - event.project_metadata.project_name: {event.get('project_metadata', {}).get('project_name')}")
-        print(f"  - event.project_id: {event.get('project_id')}")
-        if 'storyExecutorResult' in event:
-            print(f"  - story_result.project_id: {story_result.get('project_id')}")
-        print(f"  - data.project_id: {data.get('project_id')}")
-        print(f"  - architecture.project_id: {architecture.get('project_id')}")
-        
-        project_id = (
-            pipeline_context.get('project_id') or
-            event.get('project_metadata', {}).get('project_name') or
-            event.get('project_id') or
-            (story_result.get('project_id') if 'storyExecutorResult' in event and story_result else None) or
-            data.get('project_id') or
-            architecture.get('project_id') or
+        # Extract project_id from the first source that has one, in priority order
+        project_id_sources = (
+            ('pipeline_context.project_id', pipeline_context, 'project_id'),
+            ('event.project_metadata.project_name', event.get('project_metadata'), 'project_name'),
+            ('event.project_id', event, 'project_id'),
+            ('story_result.project_id', story_result if 'storyExecutorResult' in event else None, 'project_id'),
+            ('data.project_id', data, 'project_id'),
+            ('architecture.project_id', architecture, 'project_id'),
+        )
+        if _DEBUG_PROJECT_ID:
+            print("Searching for project_id...")
+            for label, source, key in project_id_sources:
+                print(f"  - {label}: {source.get(key) if source else None}")
+        
+        project_id = next(
+            (source[key] for _, source, key in project_id_sources if source and source.get(key)),
             'unknown'
         )
         
@@ -215,8 +428,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         else:
             print("No validation data available - proceeding with GitHub operations")
         
-        # Perform additional build readiness validation (NEW)
-        build_readiness_check = validate_build_readiness(generated_files, tech_stack, architecture)
+        # Perform additional build readiness validation (NEW), unless an upstream stage already confirmed it
+        upstream_readiness = validation_summary.get('build_readiness') or {}
+        if upstream_readiness.get('ready'):
+            build_readiness_check = upstream_readiness
+            print("Build readiness already confirmed upstream - skipping re-scan")
+        else:
+            build_readiness_check = validate_build_readiness(generated_files, tech_stack, architecture)
         if not build_readiness_check['ready']:
             print(f"Warning: Build readiness issues detected: {build_readiness_check['issues']}")
             # Add missing critical files to generated_files
@@ -267,11 +485,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 print(f"❌ {error_msg}")
                 raise RuntimeError(error_msg)
         
-        # 3. Create feature branch name - use timestamp and random part for uniqueness
-        # execution_id format: "github_orch_YYYYMMDD_HHMMSS_randomhex"
-        timestamp_part = execution_id.split('_')[2] if '_' in execution_id else execution_id[:8]
-        random_part = execution_id.split('_')[-1] if '_' in execution_id else os.urandom(4).hex()
-        branch_name = f"ai-generated-{timestamp_part}-{random_part}"
+        # 3. Create feature branch name - use the run date and random suffix for uniqueness
+        branch_name = f"ai-generated-{run_date}-{run_suffix}"
         print(f"Creating branch: {branch_name}")
         branch_info = github_service.create_branch(repository_info['full_name'], branch_name)
         
@@ -287,9 +502,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         workflow_files = generate_workflow_files(github_workflow_config)
         
         # 5. Retrieve file content from S3 if needed
-        if generated_files and len(generated_files) > 0 and generated_files[0].get('s3_bucket'):
+        if any(f.get('s3_bucket') for f in generated_files):
             print(f"Retrieving content for {len(generated_files)} files from S3...")
-            files_with_content = retrieve_files_from_s3(generated_files)
+            files_with_content = retrieve_files_from_s3(
+                generated_files,
+                archive_key=data.get('files_archive_s3_key'),
+                archive_bucket=data.get('files_archive_s3_bucket')
+            )
             print(f"Retrieved content for {len(files_with_content)} files")
         else:
             # Files already have content or no files to process
@@ -345,6 +564,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         pr_info = None
         if commit_info:
             pr_title = f"feat: AI-generated implementation for {project_id}"
+            validation_results_md = "\n".join(
+                f"- {r.get('validation_type', 'Unknown')}: {'✅ Passed' if r.get('passed') else '❌ Failed'}"
+                for r in validation_summary.get('validation_results', ())
+            )
             pr_body = f"""## AI-Generated Code for {project_id}
 
 ### Summary
@@ -361,7 +584,7 @@ This PR contains AI-generated code implementing the requested user stories.
 - Review the code and test the preview before merging
 
 ### Validation Results
-{chr(10).join([f"- {r.get('validation_type', 'Unknown')}: {'✅ Passed' if r.get('passed') else '❌ Failed'}" for r in validation_summary.get('validation_results', [])])}
+{validation_results_md}
 
 ---
 *Generated by AI Pipeline Orchestrator v2*
@@ -371,7 +594,9 @@ This PR contains AI-generated code implementing the requested user stories.
                 repository_info['full_name'],
                 branch_name,
                 pr_title,
-                pr_body
+                pr_body,
+                # A re-run on an existing branch most likely already has its PR open
+                prefer_existing=bool(branch_info.get('already_exists'))
             )
             print(f"Pull request created: {pr_info.get('html_url', 'Unknown')}")
         
@@ -382,10 +607,6 @@ This PR contains AI-generated code implementing the requested user stories.
         if pr_info and commit_info:
             try:
                 print("Waiting for GitHub Actions workflow to start (triggered by PR creation)...")
-                # Give GitHub a moment to trigger the workflow from the PR
-                import time
-                time.sleep(5)
-                
                 # Wait for the workflow run (with 5 minute timeout)
                 workflow_run = github_service.wait_for_workflow_run(
                     repository_info['full_name'],
@@ -446,28 +667,55 @@ This PR contains AI-generated code implementing the requested user stories.
                 'started_at': datetime.utcnow().isoformat()
             }
         
-        # 10. Store GitHub integration metadata in DynamoDB
+        # 10. Store GitHub integration metadata: full record in S3, compact pointer item in DynamoDB
+        integration_metadata = {
+            'integration_id': f"github-{execution_id}",
+            'project_id': project_id,
+            'repository_info': repository_info,
+            'commit_info': commit_info,
+            'workflow_run': workflow_run,
+            'workflow_files': workflow_files,
+            'netlify_site_info': netlify_site_info,
+            'validation_summary': validation_summary,
+            'created_at': datetime.utcnow().isoformat(),
+            'ttl': int(datetime.utcnow().timestamp()) + (30 * 24 * 60 * 60)  # 30 days
+        }
+        
+        metadata_key = f"integrations/{execution_id}.json"
         try:
-            integration_metadata = {
-                'integration_id': f"github-{execution_id}",
+            s3_client.put_object(
+                Bucket=_INTEGRATIONS_BUCKET,
+                Key=metadata_key,
+                Body=json.dumps(integration_metadata, default=str).encode('utf-8'),
+                ContentType='application/json'
+            )
+            print(f"Stored GitHub integration metadata in s3://{_INTEGRATIONS_BUCKET}/{metadata_key}")
+        except Exception as e:
+            print(f"Warning: Failed to store GitHub metadata in S3: {str(e)}")
+            # The DynamoDB item is still written, just without a pointer to a record that doesn't exist
+            metadata_key = None
+        
+        try:
+            # Store in GitHub integrations table; polled runs nest the GitHub run under 'workflow_run'
+            run_record = workflow_run or {}
+            integration_item = {
+                'integration_id': integration_metadata['integration_id'],
                 'project_id': project_id,
-                'repository_info': repository_info,
-                'commit_info': commit_info,
-                'workflow_run': workflow_run,
-                'workflow_files': workflow_files,
-                'netlify_site_info': netlify_site_info,
-                'validation_summary': validation_summary,
-                'created_at': datetime.utcnow().isoformat(),
-                'ttl': int(datetime.utcnow().timestamp()) + (30 * 24 * 60 * 60)  # 30 days
+                'repo_url': repository_info.get('html_url'),
+                'commit_sha': (commit_info or {}).get('sha'),
+                'pr_url': (pr_info or {}).get('html_url'),
+                'workflow_run_id': str(run_record.get('id') or run_record.get('workflow_run', {}).get('id', '')),
+                'netlify_site_id': (netlify_site_info or {}).get('id'),
+                'created_at': integration_metadata['created_at'],
+                'ttl': integration_metadata['ttl']
             }
-            
-            # Store in GitHub integrations table
-            dynamodb = boto3.resource('dynamodb')
-            table = dynamodb.Table(os.environ.get('GITHUB_INTEGRATIONS_TABLE', 'ai-pipeline-v2-github-integrations-dev'))
-            table.put_item(Item=integration_metadata)
-            print(f"Stored GitHub integration metadata in DynamoDB")
+            if metadata_key:
+                integration_item['metadata_s3_bucket'] = _INTEGRATIONS_BUCKET
+                integration_item['metadata_s3_key'] = metadata_key
+            integrations_table.put_item(Item=integration_item)
+            print("Stored GitHub integration record in DynamoDB")
         except Exception as e:
-            print(f"Warning: Failed to store GitHub metadata: {str(e)}")
+            print(f"Warning: Failed to store GitHub integration record: {str(e)}")
         
         # Prepare response
         # Prepare response message based on what was accomplished
@@ -521,9 +769,21 @@ class GitHubService:
             "Accept": "application/vnd.github.v3+json",
             "X-GitHub-Api-Version": "2022-11-28"
         } if self.github_token else None
+        
+        # {repo_full_name: (key_id, SealedBox)} so several secrets share one public-key fetch
+        self._sealed_box_cache: Dict[str, Tuple[str, Any]] = {}
+        
+        # Module-wide keep-alive session: every API call, in this and later warm invocations, reuses pooled TLS connections
+        self.session = _get_github_session()
+        if self.headers:
+            self.session.headers.update(self.headers)
 
     def _get_github_token(self) -> Optional[str]:
-        """Retrieve GitHub token from AWS Secrets Manager."""
+        """Retrieve GitHub token via the secrets extension or Secrets Manager, once per warm container."""
+        global _GITHUB_TOKEN_CACHE
+        if _GITHUB_TOKEN_CACHE:
+            return _GITHUB_TOKEN_CACHE
+        
         try:
             secret_name = os.environ.get('GITHUB_TOKEN_SECRET_ARN', 'ai-pipeline-v2/github-token-dev')
             # Skip if secret name is empty or not configured
@@ -531,11 +791,11 @@ class GitHubService:
                 print("Info: GitHub token secret not configured - using mock mode")
                 return None
             
-            response = secrets_client.get_secret_value(SecretId=secret_name)
             # Parse JSON secret value
-            import json
-            secret_data = json.loads(response['SecretString'])
-            return secret_data.get('token', '')
+            secret_data = json.loads(_get_secret_string(secret_name))
+            # Only a real token is cached, so a failed or empty read is retried next invocation
+            _GITHUB_TOKEN_CACHE = secret_data.get('token', '')
+            return _GITHUB_TOKEN_CACHE
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == 'DecryptionFailureException':
@@ -577,15 +837,14 @@ class GitHubService:
                 'has_projects': False
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/user/repos",
-                headers=self.headers,
                 json=repo_data,
                 timeout=30
             )
             
             if response.status_code == 201:
-                repo_info = response.json()
+                repo_info = _response_json(response)
                 print(f"✅ Created repository: {repo_info['html_url']}")
                 return repo_info
             else:
@@ -601,38 +860,53 @@ class GitHubService:
         """Check if repository exists and return its info."""
         try:
             # Get authenticated user info
-            user_response = requests.get(
-                f"{self.base_url}/user",
-                headers=self.headers,
-                timeout=30
-            )
+            user_status, user_info = self._cached_get(f"{self.base_url}/user")
             
-            if user_response.status_code == 200:
-                username = user_response.json()['login']
+            if user_status == 200:
+                username = user_info['login']
                 print(f"Authenticated as GitHub user: {username}")
             else:
-                print(f"Failed to get GitHub user info: {user_response.status_code}")
+                print(f"Failed to get GitHub user info: {user_status}")
                 return None
             
             # Check if repository exists
-            repo_response = requests.get(
-                f"{self.base_url}/repos/{username}/{project_name}",
-                headers=self.headers,
-                timeout=30
-            )
+            repo_status, repo_info = self._cached_get(f"{self.base_url}/repos/{username}/{project_name}")
             
-            if repo_response.status_code == 200:
-                return repo_response.json()
-            elif repo_response.status_code == 404:
+            if repo_status == 200:
+                return repo_info
+            elif repo_status == 404:
                 return None
             else:
-                print(f"Error checking repository: {repo_response.status_code}")
+                print(f"Error checking repository: {repo_status}")
                 return None
                 
         except Exception as e:
             print(f"❌ Error checking repository: {str(e)}")
             return None
 
+    def _cached_get(self, url: str) -> Tuple[int, Any]:
+        """GET a JSON resource, revalidating with If-None-Match; returns (status, body) with 304 mapped to 200."""
+        cached = _GITHUB_ETAG_CACHE.get(url)
+        response = self.session.get(
+            url,
+            headers={'If-None-Match': cached[0]} if cached else None,
+            timeout=30
+        )
+        
+        if response.status_code == 304 and cached:
+            return 200, cached[1]
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        body = _response_json(response)
+        etag = response.headers.get('ETag')
+        if etag:
+            if url not in _GITHUB_ETAG_CACHE and len(_GITHUB_ETAG_CACHE) >= _GITHUB_ETAG_CACHE_MAX_ENTRIES:
+                # Drop the oldest entry (dicts keep insertion order)
+                del _GITHUB_ETAG_CACHE[next(iter(_GITHUB_ETAG_CACHE))]
+            _GITHUB_ETAG_CACHE[url] = (etag, body)
+        return 200, body
+
     def create_branch(self, repo_full_name: str, branch_name: str) -> Dict[str, Any]:
         """Create a new branch in the repository."""
         if not self.github_token or not self.headers:
@@ -641,24 +915,16 @@ class GitHubService:
         
         try:
             # Get default branch ref
-            response = requests.get(
-                f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/main",
-                headers=self.headers,
-                timeout=30
-            )
+            status, ref_info = self._cached_get(f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/main")
             
-            if response.status_code == 404:
+            if status == 404:
                 # Try master if main doesn't exist
-                response = requests.get(
-                    f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/master",
-                    headers=self.headers,
-                    timeout=30
-                )
+                status, ref_info = self._cached_get(f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/master")
             
-            if response.status_code == 200:
-                sha = response.json()['object']['sha']
+            if status == 200:
+                sha = ref_info['object']['sha']
             else:
-                print(f"Failed to get default branch: {response.status_code}")
+                print(f"Failed to get default branch: {status}")
                 return {}
             
             # Create new branch
@@ -667,19 +933,18 @@ class GitHubService:
                 'sha': sha
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/repos/{repo_full_name}/git/refs",
-                headers=self.headers,
                 json=branch_data,
                 timeout=30
             )
             
             if response.status_code == 201:
                 print(f"✅ Created branch: {branch_name}")
-                return response.json()
+                return _response_json(response)
             elif response.status_code == 422:
                 print(f"Branch {branch_name} already exists")
-                return {"ref": f"refs/heads/{branch_name}"}
+                return {"ref": f"refs/heads/{branch_name}", "already_exists": True}
             else:
                 print(f"Failed to create branch: {response.status_code} - {response.text}")
                 return {}
@@ -701,138 +966,150 @@ class GitHubService:
             # This ensures most projects commit in a single batch, avoiding multiple workflow triggers
             batch_size = 500
             total_files = len(files)
+            total_batches = (total_files - 1) // batch_size + 1
             
-            for i in range(0, total_files, batch_size):
-                batch = files[i:i + batch_size]
-                batch_message = f"{commit_message} (batch {i//batch_size + 1}/{(total_files-1)//batch_size + 1})"
-                
-                # Get the current commit SHA
-                ref_response = requests.get(
-                    f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/{branch_name}",
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if ref_response.status_code != 200:
-                    print(f"Failed to get branch ref: {ref_response.status_code}")
-                    continue
-                
-                current_sha = ref_response.json()['object']['sha']
-                
-                # Get the tree SHA
-                commit_response = requests.get(
-                    f"{self.base_url}/repos/{repo_full_name}/git/commits/{current_sha}",
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if commit_response.status_code != 200:
-                    print(f"Failed to get commit: {commit_response.status_code}")
-                    continue
+            # One pool for the whole commit; blobs upload while the branch ref and base tree are fetched
+            with ThreadPoolExecutor(max_workers=_BLOB_UPLOAD_WORKERS) as executor:
+                # Plan every batch up front: REST batches submit their blobs now, so later batches
+                # upload while earlier ones are still creating their tree, commit and ref update
+                plans = []
+                for batch_number, i in enumerate(range(0, total_files, batch_size), start=1):
+                    batch = files[i:i + batch_size]
+                    batch_message = f"{commit_message} (batch {batch_number}/{total_batches})"
+                    
+                    # Encode each file once into (path, base64) pairs shared by every commit path; empty files are
+                    # dropped, and a file that can't be encoded is reported with its batch instead of aborting the commit
+                    encoded = [_encode_commit_file(file_info) for file_info in batch]
+                    encode_failures = [problem for _, problem in encoded if problem]
+                    jobs = [job for job, _ in encoded if job and job[1]]
+                    skipped_empty = len(encoded) - len(jobs) - len(encode_failures)
+                    
+                    # Whole batch in one GraphQL commit when it fits; otherwise the blob/tree/commit/ref REST chain
+                    use_graphql = bool(jobs) and sum(len(content_b64) for _, content_b64 in jobs) <= _GRAPHQL_COMMIT_MAX_BYTES
+                    
+                    # Blobs don't depend on the branch state; map keeps tree entries in file order
+                    blob_results = None if use_graphql else executor.map(
+                        lambda job: self._create_blob(repo_full_name, *job), jobs
+                    )
+                    plans.append((batch_number, batch_message, jobs, skipped_empty, encode_failures, use_graphql, blob_results))
                 
-                base_tree_sha = commit_response.json()['tree']['sha']
+                # Branch head and its tree, carried from each commit we make; None means look it up
+                current_sha = None
+                base_tree_sha = None
                 
-                # Create blobs for each file
-                tree_items = []
-                for file_info in batch:
-                    try:
-                        content = file_info.get('content', '')
-                        file_path = file_info['file_path']
-                        
-                        # Skip empty files
-                        if not content:
-                            print(f"Skipping empty file: {file_path}")
+                for batch_number, batch_message, jobs, skipped_empty, encode_failures, use_graphql, blob_results in plans:
+                    # A lone new file commits in one Contents API call, with no ref lookup or tree
+                    if use_graphql and len(jobs) == 1:
+                        contents_commit = self._commit_single_file(repo_full_name, branch_name, batch_message, *jobs[0])
+                        if contents_commit:
+                            new_commit_sha = contents_commit['sha']
+                            current_sha, base_tree_sha = new_commit_sha, contents_commit['tree']['sha']
+                            print(f"✅ Committed batch {batch_number} with 1 file")
+                            _log_failed_files(encode_failures)
                             continue
+                    
+                    # Get the current commit SHA
+                    if current_sha is None:
+                        current_sha, base_tree_sha = self._get_branch_head(repo_full_name, branch_name), None
+                        if current_sha is None:
+                            continue
+                    
+                    if use_graphql:
+                        graphql_commit = self._commit_via_graphql(repo_full_name, branch_name, current_sha, batch_message, jobs)
+                        if graphql_commit:
+                            new_commit_sha = graphql_commit['oid']
+                            current_sha, base_tree_sha = new_commit_sha, graphql_commit['tree']['oid']
+                            print(f"✅ Committed batch {batch_number} with {len(jobs)} files")
+                            _log_failed_files(encode_failures)
+                            continue
+                        print("GraphQL commit failed - falling back to REST blob upload")
+                        blob_results = executor.map(lambda job: self._create_blob(repo_full_name, *job), jobs)
                         
-                        # Create blob
-                        import base64
-                        blob_data = {
-                            'content': base64.b64encode(content.encode()).decode(),
-                            'encoding': 'base64'
-                        }
-                        
-                        blob_response = requests.post(
-                            f"{self.base_url}/repos/{repo_full_name}/git/blobs",
-                            headers=self.headers,
-                            json=blob_data,
+                        # The head may have moved, or the mutation may have landed before a timeout or 502;
+                        # a commit on the stale head would be refused by the non-forced ref update
+                        current_sha, base_tree_sha = self._get_branch_head(repo_full_name, branch_name), None
+                        if current_sha is None:
+                            continue
+                    
+                    # Get the tree SHA
+                    if base_tree_sha is None:
+                        commit_response = self.session.get(
+                            f"{self.base_url}/repos/{repo_full_name}/git/commits/{current_sha}",
                             timeout=30
                         )
                         
-                        if blob_response.status_code == 201:
-                            blob_sha = blob_response.json()['sha']
-                            tree_items.append({
-                                'path': file_path,
-                                'mode': '100644',
-                                'type': 'blob',
-                                'sha': blob_sha
-                            })
-                        else:
-                            print(f"Failed to create blob for {file_path}: {blob_response.status_code}")
-                            
-                    except Exception as e:
-                        print(f"Error processing file {file_path}: {str(e)}")
+                        if commit_response.status_code != 200:
+                            print(f"Failed to get commit: {commit_response.status_code}")
+                            continue
+                        
+                        base_tree_sha = _response_json(commit_response)['tree']['sha']
+                    
+                    blob_outcomes = list(blob_results)
+                    tree_items = [entry for entry, _ in blob_outcomes if entry]
+                    failures = encode_failures + [problem for _, problem in blob_outcomes if problem]
+                    print(f"Batch {batch_number}: {len(tree_items)} blobs created, {skipped_empty} empty, {len(failures)} failed")
+                    _log_failed_files(failures)
+                    
+                    if not tree_items:
+                        print("No valid files to commit in this batch")
                         continue
-                
-                if not tree_items:
-                    print("No valid files to commit in this batch")
-                    continue
-                
-                # Create tree
-                tree_data = {
-                    'base_tree': base_tree_sha,
-                    'tree': tree_items
-                }
-                
-                tree_response = requests.post(
-                    f"{self.base_url}/repos/{repo_full_name}/git/trees",
-                    headers=self.headers,
-                    json=tree_data,
-                    timeout=60
-                )
-                
-                if tree_response.status_code != 201:
-                    print(f"Failed to create tree: {tree_response.status_code}")
-                    continue
-                
-                new_tree_sha = tree_response.json()['sha']
-                
-                # Create commit
-                commit_data = {
-                    'message': batch_message,
-                    'tree': new_tree_sha,
-                    'parents': [current_sha]
-                }
-                
-                new_commit_response = requests.post(
-                    f"{self.base_url}/repos/{repo_full_name}/git/commits",
-                    headers=self.headers,
-                    json=commit_data,
-                    timeout=30
-                )
-                
-                if new_commit_response.status_code != 201:
-                    print(f"Failed to create commit: {new_commit_response.status_code}")
-                    continue
-                
-                new_commit_sha = new_commit_response.json()['sha']
-                
-                # Update branch reference
-                update_ref_data = {
-                    'sha': new_commit_sha,
-                    'force': False
-                }
-                
-                update_response = requests.patch(
-                    f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/{branch_name}",
-                    headers=self.headers,
-                    json=update_ref_data,
-                    timeout=30
-                )
-                
-                if update_response.status_code == 200:
-                    print(f"✅ Committed batch {i//batch_size + 1} with {len(tree_items)} files")
-                else:
-                    print(f"Failed to update branch ref: {update_response.status_code}")
+                    
+                    # Create tree
+                    tree_data = {
+                        'base_tree': base_tree_sha,
+                        'tree': tree_items
+                    }
+                    
+                    tree_response = self._post_json(
+                        f"{self.base_url}/repos/{repo_full_name}/git/trees",
+                        tree_data,
+                        timeout=60
+                    )
+                    
+                    if tree_response.status_code != 201:
+                        print(f"Failed to create tree: {tree_response.status_code}")
+                        continue
+                    
+                    new_tree_sha = _response_json(tree_response)['sha']
+                    
+                    # Create commit
+                    commit_data = {
+                        'message': batch_message,
+                        'tree': new_tree_sha,
+                        'parents': [current_sha]
+                    }
+                    
+                    new_commit_response = self.session.post(
+                        f"{self.base_url}/repos/{repo_full_name}/git/commits",
+                        json=commit_data,
+                        timeout=30
+                    )
+                    
+                    if new_commit_response.status_code != 201:
+                        print(f"Failed to create commit: {new_commit_response.status_code}")
+                        continue
+                    
+                    new_commit_sha = _response_json(new_commit_response)['sha']
+                    
+                    # Update branch reference
+                    update_ref_data = {
+                        'sha': new_commit_sha,
+                        'force': False
+                    }
+                    
+                    update_response = self.session.patch(
+                        f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/{branch_name}",
+                        json=update_ref_data,
+                        timeout=30
+                    )
+                    
+                    if update_response.status_code == 200:
+                        current_sha, base_tree_sha = new_commit_sha, new_tree_sha
+                        print(f"✅ Committed batch {batch_number} with {len(tree_items)} files")
+                    else:
+                        print(f"Failed to update branch ref: {update_response.status_code}")
+                        # The branch may have moved; look it up again for the next batch
+                        current_sha = None
             
             return {"sha": new_commit_sha if 'new_commit_sha' in locals() else ""}
             
@@ -840,24 +1117,154 @@ class GitHubService:
             print(f"Error committing files: {str(e)}")
             return {}
 
-    def _encrypt_secret_for_github(self, public_key_base64: str, secret_value: str) -> str:
+    def _get_branch_head(self, repo_full_name: str, branch_name: str) -> Optional[str]:
+        """Return the branch's current commit SHA, or None if the ref can't be read."""
+        ref_response = self.session.get(
+            f"{self.base_url}/repos/{repo_full_name}/git/refs/heads/{branch_name}",
+            timeout=30
+        )
+        
+        if ref_response.status_code != 200:
+            print(f"Failed to get branch ref: {ref_response.status_code}")
+            return None
+        
+        return _response_json(ref_response)['object']['sha']
+
+    def _create_blob(self, repo_full_name: str, file_path: str,
+                     content_b64: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
-        Encrypt secret for GitHub using PyNaCl with proper error handling.
-        GitHub requires libsodium/NaCl encryption - base64 fallback does not work.
+        Upload one already-encoded file as a git blob.
+        
+        Returns (tree entry, None) on success and (None, reason) on failure;
+        the caller logs one summary per batch.
         """
+        try:
+            # Create blob
+            blob_data = {
+                'content': content_b64,
+                'encoding': 'base64'
+            }
+            
+            blob_response = self._post_json(
+                f"{self.base_url}/repos/{repo_full_name}/git/blobs",
+                blob_data,
+                timeout=30
+            )
+            
+            if blob_response.status_code == 201:
+                return {
+                    'path': file_path,
+                    'mode': '100644',
+                    'type': 'blob',
+                    'sha': _response_json(blob_response)['sha']
+                }, None
+            return None, f"{file_path}: HTTP {blob_response.status_code}"
+                
+        except Exception as e:
+            return None, f"{file_path}: {str(e)}"
+
+    def _commit_single_file(self, repo_full_name: str, branch_name: str, message: str,
+                            file_path: str, content_b64: str) -> Optional[Dict[str, Any]]:
+        """Create one file via the Contents API; returns the new commit, or None so the caller uses the batch path."""
+        try:
+            # Escape '#', '?', '%' and spaces so the PUT targets exactly this path; '/' stays literal
+            response = self.session.put(
+                f"{self.base_url}/repos/{repo_full_name}/contents/{quote(file_path)}",
+                json={'message': message, 'content': content_b64, 'branch': branch_name},
+                timeout=30
+            )
+            if response.status_code == 201:
+                return _response_json(response)['commit']
+            # 422 means the file already exists (updates need its blob SHA); the batch path handles that
+            print(f"Contents API commit not possible for {file_path}: {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"Error committing {file_path} via Contents API: {str(e)}")
+            return None
+
+    def _post_json(self, url: str, payload: Dict[str, Any], timeout: int):
+        """POST a JSON payload serialized with _json_dumps_bytes."""
+        return self.session.post(url, data=_json_dumps_bytes(payload), headers={'Content-Type': 'application/json'}, timeout=timeout)
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run a GraphQL request and return its data, or None on HTTP or GraphQL errors."""
+        response = self._post_json(
+            f"{self.base_url}/graphql",
+            {'query': query, 'variables': variables},
+            timeout=120
+        )
+        if response.status_code != 200:
+            print(f"GraphQL request failed: {response.status_code}")
+            return None
+        result = _response_json(response)
+        if result.get('errors'):
+            print(f"GraphQL errors: {[e.get('message') for e in result['errors']]}")
+            return None
+        return result.get('data')
+
+    def _commit_via_graphql(self, repo_full_name: str, branch_name: str, head_sha: str,
+                            message: str, files: List[Tuple[str, str]]) -> Optional[Dict[str, Any]]:
+        """Commit (path, base64) files to the branch in one createCommitOnBranch mutation; returns the new commit's oid and tree."""
+        headline, _, body = message.partition('\n')
+        try:
+            data = self._graphql(
+                """
+                mutation($input: CreateCommitOnBranchInput!) {
+                  createCommitOnBranch(input: $input) { commit { oid tree { oid } } }
+                }
+                """,
+                {'input': {
+                    'branch': {'repositoryNameWithOwner': repo_full_name, 'branchName': branch_name},
+                    'expectedHeadOid': head_sha,
+                    'message': {'headline': headline, 'body': body.strip()},
+                    'fileChanges': {'additions': [{'path': path, 'contents': content_b64} for path, content_b64 in files]}
+                }}
+            )
+            return data['createCommitOnBranch']['commit'] if data else None
+        except Exception as e:
+            print(f"Error committing via GraphQL: {str(e)}")
+            return None
+
+    def _get_sealed_box(self, repo_full_name: str) -> Optional[Tuple[str, Any]]:
+        """Return (key_id, SealedBox) for the repo's Actions public key, fetched and parsed once per repo."""
+        cached = self._sealed_box_cache.get(repo_full_name)
+        if cached:
+            return cached
+        
+        key_response = self.session.get(
+            f"{self.base_url}/repos/{repo_full_name}/actions/secrets/public-key",
+            timeout=30
+        )
+        
+        if key_response.status_code != 200:
+            print(f"❌ Failed to get repository public key: {key_response.status_code} - {key_response.text}")
+            return None
+        
+        key_data = _response_json(key_response)
         try:
             # PyNaCl is required for GitHub secrets - no fallback
             from nacl import encoding, public
-            import base64
             
             print("✅ Using PyNaCl for GitHub secrets encryption")
             
-            # Create public key object from base64-encoded key
-            public_key_obj = public.PublicKey(public_key_base64.encode("utf-8"), encoding.Base64Encoder())
-            
-            # Create a sealed box for encryption
-            sealed_box = public.SealedBox(public_key_obj)
+            # Create a sealed box for encryption from the base64-encoded public key
+            sealed_box = public.SealedBox(public.PublicKey(key_data['key'].encode("utf-8"), encoding.Base64Encoder()))
             
+        except ImportError as e:
+            error_msg = f"❌ CRITICAL: PyNaCl not available ({e}) - GitHub secrets require libsodium encryption"
+            print(error_msg)
+            # GitHub secrets REQUIRE encryption - raise error instead of using broken fallback
+            raise RuntimeError(error_msg)
+        
+        self._sealed_box_cache[repo_full_name] = (key_data['key_id'], sealed_box)
+        return self._sealed_box_cache[repo_full_name]
+
+    def _encrypt_secret_for_github(self, sealed_box: Any, secret_value: str) -> str:
+        """
+        Encrypt secret for GitHub using a PyNaCl sealed box with proper error handling.
+        GitHub requires libsodium/NaCl encryption - base64 fallback does not work.
+        """
+        try:
             # Encrypt the secret value
             encrypted_bytes = sealed_box.encrypt(secret_value.encode("utf-8"))
             
@@ -866,12 +1273,6 @@ class GitHubService:
             print(f"✅ Successfully encrypted secret (length: {len(encrypted_value)})")
             return encrypted_value
             
-        except ImportError as e:
-            error_msg = f"❌ CRITICAL: PyNaCl not available ({e}) - GitHub secrets require libsodium encryption"
-            print(error_msg)
-            # GitHub secrets REQUIRE encryption - raise error instead of using broken fallback
-            raise RuntimeError(error_msg)
-            
         except Exception as e:
             error_msg = f"❌ CRITICAL: Encryption failed: {e} - Cannot create GitHub secrets without encryption"
             print(error_msg)
@@ -884,23 +1285,13 @@ class GitHubService:
             return False
         
         try:
-            # First, get the repository's public key for encryption
-            key_response = requests.get(
-                f"{self.base_url}/repos/{repo_full_name}/actions/secrets/public-key",
-                headers=self.headers,
-                timeout=30
-            )
-            
-            if key_response.status_code != 200:
-                print(f"❌ Failed to get repository public key: {key_response.status_code} - {key_response.text}")
+            # First, get the repository's public key for encryption (cached after the first secret)
+            sealed = self._get_sealed_box(repo_full_name)
+            if not sealed:
                 return False
+            key_id, sealed_box = sealed
             
-            key_data = key_response.json()
-            public_key = key_data['key']
-            key_id = key_data['key_id']
-            
-            # Use encryption method with fallback
-            encrypted_value = self._encrypt_secret_for_github(public_key, secret_value)
+            encrypted_value = self._encrypt_secret_for_github(sealed_box, secret_value)
             
             # Create or update the secret
             secret_data = {
@@ -908,9 +1299,8 @@ class GitHubService:
                 'key_id': key_id
             }
             
-            response = requests.put(
+            response = self.session.put(
                 f"{self.base_url}/repos/{repo_full_name}/actions/secrets/{secret_name}",
-                headers=self.headers,
                 json=secret_data,
                 timeout=30
             )
@@ -926,14 +1316,40 @@ class GitHubService:
             print(f"❌ Error creating GitHub secret {secret_name}: {str(e)}")
             return False
 
+    def create_repository_secrets(self, repo_full_name: str, secrets: Dict[str, str]) -> bool:
+        """Create or update several repository secrets concurrently, sharing one public-key fetch; True if all succeed."""
+        if len(secrets) > 1 and self.github_token and self.headers:
+            # Warm the public-key cache once so the concurrent PUTs don't each fetch it
+            try:
+                self._get_sealed_box(repo_full_name)
+            except Exception:
+                pass  # create_repository_secret reports the failure per secret
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(secrets))) as executor:
+            results = list(executor.map(
+                lambda item: self.create_repository_secret(repo_full_name, item[0], item[1]), secrets.items()
+            ))
+        return all(results)
+
     def create_pull_request(self, repo_full_name: str, branch_name: str, title: str,
-                           body: str = "") -> Dict[str, Any]:
-        """Create a pull request from branch to main."""
+                           body: str = "", prefer_existing: bool = False) -> Dict[str, Any]:
+        """
+        Create a pull request from branch to main.
+        
+        With prefer_existing, an open PR for the branch is looked up first so
+        re-runs reuse it with a single request instead of a failed POST.
+        """
         if not self.github_token or not self.headers:
             print("Warning: GitHub token not available - skipping PR creation")
             return {"html_url": "mock-pr-url", "number": 1}
         
         try:
+            if prefer_existing:
+                pr_info = self._find_open_pull_request(repo_full_name, branch_name)
+                if pr_info:
+                    print(f"Pull request already exists: {pr_info['html_url']}")
+                    return pr_info
+            
             pr_data = {
                 'title': title,
                 'body': body,
@@ -941,28 +1357,20 @@ class GitHubService:
                 'base': 'main'
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/repos/{repo_full_name}/pulls",
-                headers=self.headers,
                 json=pr_data,
                 timeout=30
             )
             
             if response.status_code == 201:
-                pr_info = response.json()
+                pr_info = _response_json(response)
                 print(f"✅ Created pull request: {pr_info['html_url']}")
                 return pr_info
             else:
                 # Check if PR already exists
-                existing_prs = requests.get(
-                    f"{self.base_url}/repos/{repo_full_name}/pulls",
-                    headers=self.headers,
-                    params={'head': f"{repo_full_name.split('/')[0]}:{branch_name}", 'state': 'open'},
-                    timeout=30
-                )
-                
-                if existing_prs.status_code == 200 and existing_prs.json():
-                    pr_info = existing_prs.json()[0]
+                pr_info = self._find_open_pull_request(repo_full_name, branch_name)
+                if pr_info:
                     print(f"Pull request already exists: {pr_info['html_url']}")
                     return pr_info
                 else:
@@ -973,6 +1381,19 @@ class GitHubService:
             print(f"Error creating pull request: {str(e)}")
             return {}
 
+    def _find_open_pull_request(self, repo_full_name: str, branch_name: str) -> Optional[Dict[str, Any]]:
+        """Return the open pull request whose head is branch_name, if any."""
+        existing_prs = self.session.get(
+            f"{self.base_url}/repos/{repo_full_name}/pulls",
+            params={'head': f"{repo_full_name.split('/')[0]}:{branch_name}", 'state': 'open'},
+            timeout=30
+        )
+        if existing_prs.status_code == 200:
+            prs = _response_json(existing_prs)
+            if prs:
+                return prs[0]
+        return None
+
     def wait_for_workflow_run(self, repo_full_name: str, commit_sha: str, timeout_seconds: int = 300) -> Dict[str, Any]:
         """Wait for GitHub Actions workflow to complete."""
         if not self.github_token or not self.headers:
@@ -980,65 +1401,63 @@ class GitHubService:
             return {"conclusion": "success"}
         
         try:
-            import time
             start_time = time.time()
+            poll_delay = _WORKFLOW_POLL_INITIAL
+            etag = None
+            tracked_run_id = None
             
             while time.time() - start_time < timeout_seconds:
-                # Use Workflow Runs API instead of Check Runs API for better filtering
-                response = requests.get(
-                    f"{self.base_url}/repos/{repo_full_name}/actions/runs",
-                    headers=self.headers,
-                    params={'head_sha': commit_sha, 'per_page': 20},
-                    timeout=30
-                )
+                if tracked_run_id:
+                    # Once the main run is known, poll just that run instead of listing runs for the commit
+                    response = self.session.get(
+                        f"{self.base_url}/repos/{repo_full_name}/actions/runs/{tracked_run_id}",
+                        headers={'If-None-Match': etag} if etag else None,
+                        timeout=30
+                    )
+                else:
+                    # Use Workflow Runs API instead of Check Runs API for better filtering
+                    response = self.session.get(
+                        f"{self.base_url}/repos/{repo_full_name}/actions/runs",
+                        params={'head_sha': commit_sha, 'per_page': 10},
+                        headers={'If-None-Match': etag} if etag else None,
+                        timeout=30
+                    )
                 
+                # A 304 means the runs are unchanged since the last poll, so there is nothing new to inspect
                 if response.status_code == 200:
-                    workflow_runs = response.json()
-                    if workflow_runs['total_count'] > 0:
-                        # Filter to only our main CI/CD workflow (name = "CI/CD")
-                        our_workflow_run = None
-                        for run in workflow_runs['workflow_runs']:
-                            workflow_name = run.get('name', '')
-                            print(f"🔍 Found workflow: '{workflow_name}' - {run.get('conclusion', 'in_progress')}")
+                    etag = response.headers.get('ETag')
+                    if tracked_run_id:
+                        our_workflow_run = _response_json(response)
+                    else:
+                        our_workflow_run = self._select_workflow_run(_response_json(response).get('workflow_runs', []))
+                        # Only the exact CI/CD run is pinned; a fallback pick may still be superseded by it
+                        if our_workflow_run and our_workflow_run.get('name') == 'CI/CD' and our_workflow_run.get('id'):
+                            tracked_run_id = our_workflow_run['id']
+                            etag = None
+                    
+                    if our_workflow_run:
+                        if our_workflow_run['status'] == 'completed':
+                            conclusion = our_workflow_run['conclusion']
+                            workflow_name = our_workflow_run['name']
                             
-                            # Only check our main CI/CD workflow, not Frontend/Backend CI/CD
-                            if workflow_name == 'CI/CD':
-                                our_workflow_run = run
-                                print(f"✓ Monitoring main CI/CD workflow: {workflow_name}")
-                                break
-                        
-                        if not our_workflow_run:
-                            print("⚠️ Main CI/CD workflow not found, checking all workflows...")
-                            # Fallback: if we can't find "CI/CD", look for any without Frontend/Backend
-                            for run in workflow_runs['workflow_runs']:
-                                workflow_name = run.get('name', '')
-                                if ('frontend' not in workflow_name.lower() and 
-                                    'backend' not in workflow_name.lower()):
-                                    our_workflow_run = run
-                                    print(f"✓ Using fallback workflow: {workflow_name}")
-                                    break
-                        
-                        if our_workflow_run:
-                            if our_workflow_run['status'] == 'completed':
-                                conclusion = our_workflow_run['conclusion']
-                                workflow_name = our_workflow_run['name']
-                                
-                                if conclusion == 'success':
-                                    print(f"✅ Workflow '{workflow_name}' completed successfully")
-                                    return {"conclusion": "success", "workflow_run": our_workflow_run}
-                                else:
-                                    print(f"❌ Workflow '{workflow_name}' failed with conclusion: {conclusion}")
-                                    return {
-                                        "conclusion": "failure", 
-                                        "workflow_run": our_workflow_run,
-                                        "failed_runs": [{"name": workflow_name, "conclusion": conclusion, "details_url": our_workflow_run.get('html_url', '')}]
-                                    }
+                            if conclusion == 'success':
+                                print(f"✅ Workflow '{workflow_name}' completed successfully")
+                                return {"conclusion": "success", "workflow_run": our_workflow_run}
                             else:
-                                print(f"⏳ Workflow '{our_workflow_run['name']}' still running...")
+                                print(f"❌ Workflow '{workflow_name}' failed with conclusion: {conclusion}")
+                                return {
+                                    "conclusion": "failure", 
+                                    "workflow_run": our_workflow_run,
+                                    "failed_runs": [{"name": workflow_name, "conclusion": conclusion, "details_url": our_workflow_run.get('html_url', '')}]
+                                }
                         else:
-                            print("⚠️ No relevant workflows found")
+                            print(f"⏳ Workflow '{our_workflow_run['name']}' still running...")
+                    else:
+                        print("⚠️ No relevant workflows found")
                 
-                time.sleep(10)
+                remaining = timeout_seconds - (time.time() - start_time)
+                time.sleep(max(0, min(poll_delay, remaining)))
+                poll_delay = min(_WORKFLOW_POLL_MAX, poll_delay * _WORKFLOW_POLL_FACTOR)
             
             print("⏱️ Workflow run timed out")
             return {"conclusion": "timed_out"}
@@ -1047,6 +1466,24 @@ class GitHubService:
             print(f"Error waiting for workflow: {str(e)}")
             return {"conclusion": "error"}
 
+    def _select_workflow_run(self, runs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Pick the main CI/CD run in one pass, else the first run that isn't a Frontend/Backend workflow."""
+        fallback = None
+        for run in runs:
+            workflow_name = run.get('name', '')
+            print(f"🔍 Found workflow: '{workflow_name}' - {run.get('conclusion', 'in_progress')}")
+            
+            # Only check our main CI/CD workflow, not Frontend/Backend CI/CD
+            if workflow_name == 'CI/CD':
+                print(f"✓ Monitoring main CI/CD workflow: {workflow_name}")
+                return run
+            if fallback is None and 'frontend' not in workflow_name.lower() and 'backend' not in workflow_name.lower():
+                fallback = run
+        
+        if fallback:
+            print(f"⚠️ Main CI/CD workflow not found, using fallback workflow: {fallback.get('name', '')}")
+        return fallback
+
     def check_workflow_success(self, workflow_run: Dict[str, Any]) -> bool:
         """Check if workflow run was successful."""
         return workflow_run.get('conclusion') == 'success'
@@ -1061,12 +1498,17 @@ class NetlifyService:
         self.base_url = "https://api.netlify.com/api/v1"
         
     def _get_netlify_token(self) -> str:
-        """Get Netlify token from AWS Secrets Manager."""
+        """Get Netlify token from AWS Secrets Manager, once per warm container."""
+        global _NETLIFY_TOKEN_CACHE
+        if _NETLIFY_TOKEN_CACHE:
+            return _NETLIFY_TOKEN_CACHE
+        
         try:
             secret_name = os.environ.get('NETLIFY_TOKEN_SECRET_ARN', 'ai-pipeline-v2/netlify-token-dev')
-            response = secrets_client.get_secret_value(SecretId=secret_name)
-            secret_data = json.loads(response['SecretString'])
-            return secret_data.get('token', '')
+            secret_data = json.loads(_get_secret_string(secret_name))
+            # Only a real token is cached, so a failed or empty read is retried next invocation
+            _NETLIFY_TOKEN_CACHE = secret_data.get('token', '')
+            return _NETLIFY_TOKEN_CACHE
         except Exception as e:
             print(f"Failed to retrieve Netlify token: {str(e)}")
             return ''
@@ -1074,18 +1516,13 @@ class NetlifyService:
     def create_site(self, project_name: str) -> Optional[Dict[str, Any]]:
         """Create a Netlify site for the project with DNS-compliant naming."""
         import random
-        import time
+        import requests
         
         try:
             if not self.netlify_token:
                 print("⚠️  Netlify token not available - skipping site creation")
                 return None
             
-            # DNS label maximum is 63 characters
-            # Account for "preview-pr-XXX--" prefix (up to 17 chars for PR 999)
-            # So we need site names to be max 46 chars to be safe
-            MAX_SITE_NAME_LENGTH = 46
-            
             # Generate unique site name with fallback strategies
             base_name = project_name.lower().replace('_', '-').replace(' ', '-')
             
@@ -1098,30 +1535,7 @@ class NetlifyService:
             random_suffix = str(random.randint(1000, 9999))
             
             # Try multiple naming strategies, ensuring DNS compliance
-            name_attempts = []
-            
-            # Strategy 1: Base name only (if short enough)
-            if len(base_name) <= MAX_SITE_NAME_LENGTH:
-                name_attempts.append(base_name)
-            
-            # Strategy 2: Base + timestamp (truncate base if needed)
-            name_with_time = f"{base_name}-{timestamp}"
-            if len(name_with_time) > MAX_SITE_NAME_LENGTH:
-                truncated_base = base_name[:MAX_SITE_NAME_LENGTH - len(timestamp) - 1]
-                name_with_time = f"{truncated_base}-{timestamp}"
-            name_attempts.append(name_with_time)
-            
-            # Strategy 3: Base + random (truncate base if needed)
-            name_with_random = f"{base_name}-{random_suffix}"
-            if len(name_with_random) > MAX_SITE_NAME_LENGTH:
-                truncated_base = base_name[:MAX_SITE_NAME_LENGTH - len(str(random_suffix)) - 1]
-                name_with_random = f"{truncated_base}-{random_suffix}"
-            name_attempts.append(name_with_random)
-            
-            # Strategy 4: Compact name with timestamp
-            compact_name = f"{base_name[:20]}-{timestamp}"
-            if compact_name not in name_attempts and len(compact_name) <= MAX_SITE_NAME_LENGTH:
-                name_attempts.append(compact_name)
+            name_attempts = _netlify_site_name_attempts(base_name, timestamp, random_suffix)
             
             site_data_base = {
                 "build_settings": {
@@ -1134,8 +1548,9 @@ class NetlifyService:
                 site_data = {**site_data_base, "name": site_name}
                 
                 # Log the name length for DNS validation
-                print(f"📦 Creating Netlify site (attempt {attempt}): {site_name} (length: {len(site_name)} chars)")
-                if len(site_name) > MAX_SITE_NAME_LENGTH:
+                name_length = len(site_name)
+                print(f"📦 Creating Netlify site (attempt {attempt}): {site_name} (length: {name_length} chars)")
+                if name_length > _NETLIFY_MAX_SITE_NAME_LENGTH:
                     print(f"⚠️  Warning: Site name may be too long for DNS with PR prefixes")
                 response = requests.post(
                     f"{self.base_url}/sites",
@@ -1184,21 +1599,11 @@ class NetlifyService:
             
             print(f"🔐 Adding Netlify secrets to {repo_full_name}")
             
-            # Add NETLIFY_AUTH_TOKEN secret
-            auth_success = github_service.create_repository_secret(
-                repo_full_name, 
-                'NETLIFY_AUTH_TOKEN', 
-                self.netlify_token
-            )
-            
-            # Add NETLIFY_SITE_ID secret
-            site_success = github_service.create_repository_secret(
-                repo_full_name,
-                'NETLIFY_SITE_ID',
-                site_id
-            )
-            
-            if auth_success and site_success:
+            # Add NETLIFY_AUTH_TOKEN and NETLIFY_SITE_ID secrets
+            if github_service.create_repository_secrets(repo_full_name, {
+                'NETLIFY_AUTH_TOKEN': self.netlify_token,
+                'NETLIFY_SITE_ID': site_id
+            }):
                 print("✅ Successfully added Netlify secrets to GitHub repository")
                 return True
             else:
@@ -1213,20 +1618,56 @@ class NetlifyService:
 # Helper functions below
 
 
+# DNS label maximum is 63 characters
+# Account for "preview-pr-XXX--" prefix (up to 17 chars for PR 999)
+# So we need site names to be max 46 chars to be safe
+_NETLIFY_MAX_SITE_NAME_LENGTH = 46
+
+
+def _netlify_site_name_attempts(base_name: str, timestamp: str, random_suffix: str) -> List[str]:
+    """Candidate Netlify site names in preference order, each within the DNS-safe length."""
+    # Room left for the base once "-<suffix>" is appended; slicing is a no-op when the base already fits
+    room_for_timestamp = _NETLIFY_MAX_SITE_NAME_LENGTH - len(timestamp) - 1
+    room_for_random = _NETLIFY_MAX_SITE_NAME_LENGTH - len(random_suffix) - 1
+    
+    candidates = [
+        # Strategy 1: Base name only (if short enough)
+        base_name if len(base_name) <= _NETLIFY_MAX_SITE_NAME_LENGTH else None,
+        # Strategy 2: Base + timestamp (truncate base if needed)
+        f"{base_name[:room_for_timestamp]}-{timestamp}",
+        # Strategy 3: Base + random (truncate base if needed)
+        f"{base_name[:room_for_random]}-{random_suffix}",
+        # Strategy 4: Compact name with timestamp
+        f"{base_name[:20]}-{timestamp}",
+    ]
+    return [name for name in dict.fromkeys(candidates) if name is not None and len(name) <= _NETLIFY_MAX_SITE_NAME_LENGTH]
+
+
 def generate_workflow_files(github_workflow_config: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Generate GitHub Actions workflow files based on configuration."""
     
-    tech_stack = github_workflow_config.get('tech_stack', 'react_fullstack')
-    workflow_name = github_workflow_config.get('workflow_name', 'CI/CD')
-    node_version = github_workflow_config.get('node_version', '18')
-    build_commands = github_workflow_config.get('build_commands', ['npm install', 'npm run build', 'npm test'])
+    files = _generate_workflow_files(
+        github_workflow_config.get('tech_stack', 'react_fullstack'),
+        github_workflow_config.get('workflow_name', 'CI/CD'),
+        github_workflow_config.get('node_version', '18'),
+        tuple(github_workflow_config.get('build_commands', ['npm install', 'npm run build', 'npm test'])),
+        github_workflow_config.get('workflow_file', 'ci-cd.yml')
+    )
+    # Fresh dicts per call so callers can't mutate the cached entries
+    return [dict(f) for f in files]
+
+
+@functools.lru_cache(maxsize=16)
+def _generate_workflow_files(tech_stack: str, workflow_name: str, node_version: str,
+                             build_commands: tuple, workflow_file: str) -> tuple:
+    """Render the workflow files for one configuration; pure, so cached per warm container."""
     
     # Generate main CI/CD workflow
-    workflow_content = generate_workflow_yaml(tech_stack, workflow_name, node_version, build_commands)
+    workflow_content = generate_workflow_yaml(tech_stack, workflow_name, node_version, list(build_commands))
     
     workflow_files = [
         {
-            'path': f".github/workflows/{github_workflow_config.get('workflow_file', 'ci-cd.yml')}",
+            'path': f".github/workflows/{workflow_file}",
             'content': workflow_content,
             'type': 'workflow',
             'size_bytes': len(workflow_content.encode('utf-8'))
@@ -1254,21 +1695,12 @@ def generate_workflow_files(github_workflow_config: Dict[str, Any]) -> List[Dict
             'size_bytes': len(dockerfile_content.encode('utf-8'))
         })
     
-    return workflow_files
+    return tuple(workflow_files)
 
 
-def generate_workflow_yaml(tech_stack: str, workflow_name: str, node_version: str, 
-                          build_commands: List[str]) -> str:
-    """Generate GitHub Actions workflow YAML content."""
-    
-    # Determine publish directory based on tech stack
-    # react_fullstack has monorepo structure with client/ and server/
-    if tech_stack == 'react_fullstack':
-        publish_dir = './client/dist'
-    else:
-        publish_dir = './dist'
-    
-    workflow_yaml = f"""name: {workflow_name}
+# GitHub Actions workflow, filled in by generate_workflow_yaml; safe_substitute leaves the
+# workflow's ${{ ... }} expressions and shell variables untouched
+_WORKFLOW_YAML_TEMPLATE = string.Template("""name: $workflow_name
 
 on:
   pull_request:
@@ -1309,21 +1741,21 @@ jobs:
       if: steps.check-locks.outputs.has_npm_lock == 'true'
       uses: actions/setup-node@v4
       with:
-        node-version: '{node_version}'
+        node-version: '$node_version'
         cache: 'npm'
     
     - name: Setup Node.js with yarn cache
       if: steps.check-locks.outputs.has_yarn_lock == 'true'
       uses: actions/setup-node@v4
       with:
-        node-version: '{node_version}'
+        node-version: '$node_version'
         cache: 'yarn'
     
     - name: Setup Node.js without cache
       if: steps.check-locks.outputs.has_npm_lock != 'true' && steps.check-locks.outputs.has_yarn_lock != 'true'
       uses: actions/setup-node@v4
       with:
-        node-version: '{node_version}'
+        node-version: '$node_version'
     
     - name: Install dependencies
       run: |
@@ -1334,13 +1766,13 @@ jobs:
         elif [ -f "package-lock.json" ]; then
           echo "Using npm ci for faster, reliable installs..."
           # Try npm ci first, but fall back to npm install if lock file is out of sync
-          npm ci || {{
+          npm ci || {
             echo "⚠️  npm ci failed - lock file may be out of sync"
             echo "📦 Falling back to npm install to regenerate lock file..."
             rm -f package-lock.json
             npm install
             echo "✅ Generated fresh package-lock.json"
-          }}
+          }
         elif [ -f "package.json" ]; then
           echo "Using npm install (no lock file found)..."
           npm install
@@ -1355,10 +1787,10 @@ jobs:
         if [ -f "package.json" ]; then
           # Check if test script exists
           if grep -q '"test":' package.json; then
-            {build_commands[2] if len(build_commands) > 2 else 'npm test'} || {{
+            $test_command || {
               echo "⚠️  Tests failed but continuing workflow"
               exit 0
-            }}
+            }
           else
             echo "⚠️  No test script found in package.json - skipping tests"
           fi
@@ -1386,7 +1818,7 @@ jobs:
           cd ..
         else
           echo "📦 Standard project structure"
-          {build_commands[1] if len(build_commands) > 1 else 'npm run build'}
+          $build_command
         fi
     
     - name: Verify and prepare build outputs
@@ -1432,24 +1864,24 @@ jobs:
         echo "🔍 Pre-deployment validation..."
         
         # Check if publish directory exists
-        if [ -d "{publish_dir}" ]; then
-          echo "✅ Publish directory exists: {publish_dir}"
+        if [ -d "$publish_dir" ]; then
+          echo "✅ Publish directory exists: $publish_dir"
           
           # Check if directory has content
-          FILE_COUNT=$(find {publish_dir} -type f | wc -l)
+          FILE_COUNT=$(find $publish_dir -type f | wc -l)
           if [ "$FILE_COUNT" -gt 0 ]; then
             echo "✅ Found $FILE_COUNT files to deploy"
             
             # Check for critical files
-            if [ -f "{publish_dir}/index.html" ]; then
+            if [ -f "$publish_dir/index.html" ]; then
               echo "✅ index.html present"
             else
-              echo "⚠️  Warning: index.html not found in {publish_dir}"
+              echo "⚠️  Warning: index.html not found in $publish_dir"
             fi
             
             # Show directory structure
             echo "📁 Build output structure:"
-            ls -la {publish_dir} | head -10
+            ls -la $publish_dir | head -10
           else
             echo "❌ Publish directory is empty!"
             echo "Attempting to locate build output..."
@@ -1463,7 +1895,7 @@ jobs:
             done
           fi
         else
-          echo "❌ Publish directory does not exist: {publish_dir}"
+          echo "❌ Publish directory does not exist: $publish_dir"
           echo "Build may have failed or output is in a different location"
           
           # Show what directories do exist
@@ -1476,19 +1908,19 @@ jobs:
       id: netlify
       uses: nwtgck/actions-netlify@v3.0
       with:
-        publish-dir: '{publish_dir}'
+        publish-dir: '$publish_dir'
         production-branch: main
         production-deploy: false
-        github-token: ${{{{ secrets.GITHUB_TOKEN }}}}
-        deploy-message: "Deploy from GitHub Actions PR #${{{{ github.event.pull_request.number }}}}"
-        alias: preview-pr-${{{{ github.event.pull_request.number }}}}
+        github-token: ${{ secrets.GITHUB_TOKEN }}
+        deploy-message: "Deploy from GitHub Actions PR #${{ github.event.pull_request.number }}"
+        alias: preview-pr-${{ github.event.pull_request.number }}
         enable-pull-request-comment: true
         enable-commit-comment: false
         enable-commit-status: true
         overwrites-pull-request-comment: true
       env:
-        NETLIFY_AUTH_TOKEN: ${{{{ secrets.NETLIFY_AUTH_TOKEN }}}}
-        NETLIFY_SITE_ID: ${{{{ secrets.NETLIFY_SITE_ID }}}}
+        NETLIFY_AUTH_TOKEN: ${{ secrets.NETLIFY_AUTH_TOKEN }}
+        NETLIFY_SITE_ID: ${{ secrets.NETLIFY_SITE_ID }}
       timeout-minutes: 10
       continue-on-error: true
     
@@ -1496,17 +1928,17 @@ jobs:
       if: success() && steps.netlify.outputs.deploy-url
       run: |
         echo "🚀 Deployed to Netlify!"
-        echo "Preview URL: ${{{{ steps.netlify.outputs.deploy-url }}}}"
+        echo "Preview URL: ${{ steps.netlify.outputs.deploy-url }}"
     
     - name: Validate Deployment
       if: success() && steps.netlify.outputs.deploy-url
       run: |
         echo "🔍 Validating deployment..."
-        DEPLOY_URL="${{{{ steps.netlify.outputs.deploy-url }}}}"
+        DEPLOY_URL="${{ steps.netlify.outputs.deploy-url }}"
         
         # Check if deployment URL is accessible
         echo "Checking if deployment is accessible..."
-        HTTP_STATUS=$(curl -s -o /dev/null -w "%{{http_code}}" "$DEPLOY_URL" || echo "000")
+        HTTP_STATUS=$(curl -s -o /dev/null -w "%{http_code}" "$DEPLOY_URL" || echo "000")
         
         if [ "$HTTP_STATUS" = "200" ]; then
           echo "✅ Deployment is accessible (HTTP $HTTP_STATUS)"
@@ -1520,15 +1952,15 @@ jobs:
         # Verify build artifacts were created
         echo ""
         echo "📦 Verifying build artifacts..."
-        if [ -d "{publish_dir}" ]; then
-          echo "✅ Build output directory exists: {publish_dir}"
+        if [ -d "$publish_dir" ]; then
+          echo "✅ Build output directory exists: $publish_dir"
           
           # Count files in build output
-          FILE_COUNT=$(find {publish_dir} -type f | wc -l)
+          FILE_COUNT=$(find $publish_dir -type f | wc -l)
           echo "   Found $FILE_COUNT files in build output"
           
           # Check for index.html (essential for SPA)
-          if [ -f "{publish_dir}/index.html" ]; then
+          if [ -f "$publish_dir/index.html" ]; then
             echo "✅ index.html found in build output"
           else
             echo "⚠️  index.html not found - deployment may be empty"
@@ -1536,9 +1968,9 @@ jobs:
           
           # List first few files as evidence
           echo "   Sample files:"
-          find {publish_dir} -type f | head -5 | sed 's/^/     - /'
+          find $publish_dir -type f | head -5 | sed 's/^/     - /'
         else
-          echo "❌ Build output directory not found: {publish_dir}"
+          echo "❌ Build output directory not found: $publish_dir"
           echo "   Deployment may have succeeded with empty content"
         fi
         
@@ -1567,17 +1999,31 @@ jobs:
           echo "   - Content Size: $CONTENT_LENGTH bytes"
           echo "   The deployment reported success but may not be fully functional"
         fi
-"""
-    
-    return workflow_yaml
+""")
 
 
-def generate_netlify_config(tech_stack: str = 'react_spa') -> str:
-    """Generate Netlify configuration."""
-    # For react_fullstack, the frontend is in client/ directory
+def generate_workflow_yaml(tech_stack: str, workflow_name: str, node_version: str, 
+                          build_commands: List[str]) -> str:
+    """Generate GitHub Actions workflow YAML content."""
+    
+    # Determine publish directory based on tech stack
+    # react_fullstack has monorepo structure with client/ and server/
     if tech_stack == 'react_fullstack':
-        return """[build]
-  base = "client"
+        publish_dir = './client/dist'
+    else:
+        publish_dir = './dist'
+    
+    return _WORKFLOW_YAML_TEMPLATE.safe_substitute(
+        workflow_name=workflow_name,
+        node_version=node_version,
+        publish_dir=publish_dir,
+        build_command=build_commands[1] if len(build_commands) > 1 else 'npm run build',
+        test_command=build_commands[2] if len(build_commands) > 2 else 'npm test'
+    )
+
+
+# Netlify configuration per tech stack; react_fullstack builds the frontend from client/
+_NETLIFY_CONFIG_SPA = """[build]
   publish = "dist"
   command = "npm run build"
 
@@ -1596,9 +2042,9 @@ def generate_netlify_config(tech_stack: str = 'react_spa') -> str:
     X-XSS-Protection = "1; mode=block"
     X-Content-Type-Options = "nosniff"
 """
-    else:
-        # Standard config for react_spa and vue_spa
-        return """[build]
+_NETLIFY_CONFIGS = {
+    'react_fullstack': """[build]
+  base = "client"
   publish = "dist"
   command = "npm run build"
 
@@ -1617,11 +2063,17 @@ def generate_netlify_config(tech_stack: str = 'react_spa') -> str:
     X-XSS-Protection = "1; mode=block"
     X-Content-Type-Options = "nosniff"
 """
+}
 
 
-def generate_dockerfile(tech_stack: str) -> str:
-    """Generate Dockerfile for backend services."""
-    return """FROM node:18-alpine
+def generate_netlify_config(tech_stack: str = 'react_spa') -> str:
+    """Generate Netlify configuration."""
+    # Anything without its own entry (react_spa, vue_spa) gets the standard SPA config
+    return _NETLIFY_CONFIGS.get(tech_stack, _NETLIFY_CONFIG_SPA)
+
+
+# Dockerfile for backend services; the same for every tech stack today
+_DOCKERFILE = """FROM node:18-alpine
 
 WORKDIR /app
 
@@ -1636,28 +2088,36 @@ CMD ["npm", "start"]
 """
 
 
+def generate_dockerfile(tech_stack: str) -> str:
+    """Generate Dockerfile for backend services."""
+    return _DOCKERFILE
+
+
+# Build commands and deployment targets per tech stack
+_BUILD_COMMANDS = {
+    'react_spa': ('npm install', 'npm run build', 'npm test'),
+    'react_fullstack': ('npm install', 'npm run build', 'npm test'),
+    'node_api': ('npm install', 'npm run build', 'npm test'),
+    'vue_spa': ('npm install', 'npm run build', 'npm test'),
+    'python_api': ('pip install -r requirements.txt', 'python -m pytest', 'python -m build')
+}
+_DEPLOYMENT_TARGETS = {
+    'react_spa': 'netlify',
+    'react_fullstack': 'netlify_and_aws',
+    'node_api': 'aws_ecs',
+    'vue_spa': 'netlify', 
+    'python_api': 'aws_ecs'
+}
+
+
 def get_build_commands(tech_stack: str) -> List[str]:
     """Get build commands for the tech stack."""
-    build_commands = {
-        'react_spa': ['npm install', 'npm run build', 'npm test'],
-        'react_fullstack': ['npm install', 'npm run build', 'npm test'],
-        'node_api': ['npm install', 'npm run build', 'npm test'],
-        'vue_spa': ['npm install', 'npm run build', 'npm test'],
-        'python_api': ['pip install -r requirements.txt', 'python -m pytest', 'python -m build']
-    }
-    return build_commands.get(tech_stack.lower(), ['npm install', 'npm run build', 'npm test'])
+    return list(_BUILD_COMMANDS.get(tech_stack.lower(), ('npm install', 'npm run build', 'npm test')))
 
 
 def get_deployment_target(tech_stack: str) -> str:
     """Get deployment target for the tech stack."""
-    deployment_targets = {
-        'react_spa': 'netlify',
-        'react_fullstack': 'netlify_and_aws',
-        'node_api': 'aws_ecs',
-        'vue_spa': 'netlify', 
-        'python_api': 'aws_ecs'
-    }
-    return deployment_targets.get(tech_stack.lower(), 'netlify')
+    return _DEPLOYMENT_TARGETS.get(tech_stack.lower(), 'netlify')
 
 
 def generate_deployment_urls(project_id: str, tech_stack: str) -> Dict[str, str]:
@@ -1678,6 +2138,22 @@ def generate_deployment_urls(project_id: str, tech_stack: str) -> Dict[str, str]
     return urls
 
 
+# Critical files by tech stack that MUST be present for GitHub Actions
+# NOTE: Removed package-lock.json as it should be generated by npm install, not stubbed
+_CRITICAL_BUILD_FILES = {
+    'react_spa': frozenset({'package.json'}),
+    'react_fullstack': frozenset({'package.json'}),
+    'node_api': frozenset({'package.json'}),
+    'vue_spa': frozenset({'package.json'}),
+    'python_api': frozenset({'requirements.txt'})
+}
+_DEFAULT_CRITICAL_BUILD_FILES = frozenset({'package.json'})
+
+# Node.js stacks and the lock files any of which satisfies npm ci
+_NODE_TECH_STACKS = frozenset({'react_spa', 'react_fullstack', 'node_api', 'vue_spa'})
+_NODE_LOCK_FILES = frozenset({'package-lock.json', 'yarn.lock'})
+
+
 def validate_build_readiness(generated_files: List[Dict[str, Any]], tech_stack: str, architecture: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate that all critical build files are present for successful GitHub Actions execution.
@@ -1692,38 +2168,18 @@ def validate_build_readiness(generated_files: List[Dict[str, Any]], tech_stack:
     """
     try:
         generated_file_paths = {file.get('file_path') for file in generated_files}
-        missing_files = []
-        issues = []
-        
-        # Define critical files by tech stack that MUST be present for GitHub Actions
-        # NOTE: Removed package-lock.json as it should be generated by npm install, not stubbed
-        critical_files = {
-            'react_spa': ['package.json'],
-            'react_fullstack': ['package.json'],
-            'node_api': ['package.json'],
-            'vue_spa': ['package.json'],
-            'python_api': ['requirements.txt']
-        }
-        
-        required_files = critical_files.get(tech_stack.lower(), ['package.json'])
+        stack = tech_stack.lower()
         
         # Check for critical missing files
-        for required_file in required_files:
-            if required_file not in generated_file_paths:
-                missing_files.append(required_file)
-                issues.append(f"Missing critical build file: {required_file}")
+        missing_files = sorted(_CRITICAL_BUILD_FILES.get(stack, _DEFAULT_CRITICAL_BUILD_FILES) - generated_file_paths)
+        issues = [f"Missing critical build file: {required_file}" for required_file in missing_files]
         
         # Lock file validation for Node.js projects
         # NOTE: package-lock.json is NOT required because GitHub Actions will generate it automatically during "npm install"
         # The workflow handles this with "npm ci || { npm install && echo '✅ Generated fresh package-lock.json'; }"
-        if tech_stack.lower() in ['react_spa', 'react_fullstack', 'node_api', 'vue_spa']:
-            has_package_json = 'package.json' in generated_file_paths
-            has_package_lock = 'package-lock.json' in generated_file_paths
-            has_yarn_lock = 'yarn.lock' in generated_file_paths
-            
-            # We don't require lock files since they're auto-generated in CI/CD
-            if has_package_json and not has_package_lock and not has_yarn_lock:
-                print(f"Note: package-lock.json not present but will be auto-generated by GitHub Actions npm install")
+        # We don't require lock files since they're auto-generated in CI/CD
+        if stack in _NODE_TECH_STACKS and 'package.json' in generated_file_paths and not (generated_file_paths & _NODE_LOCK_FILES):
+            print(f"Note: package-lock.json not present but will be auto-generated by GitHub Actions npm install")
         
         # Check .gitignore presence (recommended but not critical)
         if '.gitignore' not in generated_file_paths:
@@ -1749,6 +2205,38 @@ def validate_build_readiness(generated_files: List[Dict[str, Any]], tech_stack:
         }
 
 
+@functools.lru_cache(maxsize=8)
+def _stub_package_json(tech_stack: str) -> str:
+    """Serialized minimal package.json for a (lowercased) tech stack; built once per warm container."""
+    is_vite = tech_stack in ['react_spa', 'vue_spa']
+    package_json_content = {
+        "name": "generated-project",
+        "version": "0.1.0",
+        "private": True,
+        "scripts": {
+            "dev": "vite" if is_vite else "node index.js",
+            "build": "vite build" if is_vite else "tsc",
+            "test": "vitest" if is_vite else "jest"
+        },
+        "dependencies": {
+            "react": "^18.2.0" if 'react' in tech_stack else None,
+            "vue": "^3.3.4" if 'vue' in tech_stack else None
+        },
+        "devDependencies": {
+            "typescript": "^5.0.2",
+            "vite": "^4.4.5" if is_vite else None
+        }
+    }
+    
+    # Clean up None values
+    package_json_content['dependencies'] = {k: v for k, v in package_json_content['dependencies'].items() if v is not None}
+    package_json_content['devDependencies'] = {k: v for k, v in package_json_content['devDependencies'].items() if v is not None}
+    
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(package_json_content, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(package_json_content, indent=2)
+
+
 def add_missing_build_files(generated_files: List[Dict[str, Any]], missing_files: List[str], tech_stack: str) -> List[Dict[str, Any]]:
     """
     Add minimal versions of missing critical build files to generated_files.
@@ -1763,79 +2251,53 @@ def add_missing_build_files(generated_files: List[Dict[str, Any]], missing_files
         Updated list of generated files with missing critical files added
     """
     try:
-        updated_files = list(generated_files)  # Create a copy
-        
-        # Get existing file paths to avoid duplicates
+        # Get existing file paths to avoid duplicates; package-lock.json is never stubbed because
+        # npm install must generate it (a stub without real dependency resolution broke npm ci)
         existing_paths = {f.get('file_path') for f in generated_files}
+        to_add = [
+            missing_file for missing_file in missing_files
+            if missing_file in _STUB_BUILD_FILE_LANGUAGES and missing_file not in existing_paths
+        ]
         
-        for missing_file in missing_files:
-            # Skip if file already exists
-            if missing_file in existing_paths:
-                print(f"File {missing_file} already exists in generated files - skipping")
-                continue
-            # Skip package-lock.json - it should be generated by npm install, not stubbed
-            # This was causing npm ci failures because stub didn't contain actual dependency resolution
-            if missing_file == 'package-lock.json':
-                print(f"Skipping package-lock.json stub generation - will be created by npm install")
-                continue
-                
-            elif missing_file == 'package.json':
-                # Generate minimal package.json
-                package_json_content = {
-                    "name": "generated-project",
-                    "version": "0.1.0",
-                    "private": True,
-                    "scripts": {
-                        "dev": "vite" if tech_stack.lower() in ['react_spa', 'vue_spa'] else "node index.js",
-                        "build": "vite build" if tech_stack.lower() in ['react_spa', 'vue_spa'] else "tsc",
-                        "test": "vitest" if tech_stack.lower() in ['react_spa', 'vue_spa'] else "jest"
-                    },
-                    "dependencies": {
-                        "react": "^18.2.0" if 'react' in tech_stack.lower() else None,
-                        "vue": "^3.3.4" if 'vue' in tech_stack.lower() else None
-                    },
-                    "devDependencies": {
-                        "typescript": "^5.0.2",
-                        "vite": "^4.4.5" if tech_stack.lower() in ['react_spa', 'vue_spa'] else None
-                    }
-                }
-                
-                # Clean up None values
-                package_json_content['dependencies'] = {k: v for k, v in package_json_content['dependencies'].items() if v is not None}
-                package_json_content['devDependencies'] = {k: v for k, v in package_json_content['devDependencies'].items() if v is not None}
-                
-                updated_files.append({
-                    'file_path': 'package.json',
-                    'content': json.dumps(package_json_content, indent=2),
-                    'component_id': 'build_config',
-                    'story_id': 'initialization',
-                    'file_type': 'config',
-                    'language': 'json',
-                    'auto_generated': True,
-                    'created_at': datetime.utcnow().isoformat()
-                })
-                
-            elif missing_file == 'requirements.txt':
-                # Generate minimal requirements.txt for Python
-                requirements_content = """# Python dependencies
+        # Nothing to add is the common case - hand back the caller's list without copying it
+        if not to_add:
+            return generated_files
+        
+        return generated_files + [_build_stub_file(missing_file, tech_stack) for missing_file in to_add]
+        
+    except Exception as e:
+        print(f"Error adding missing build files: {str(e)}")
+        return generated_files  # Return original files if error occurs
+
+
+# Minimal requirements.txt for Python projects
+_STUB_REQUIREMENTS_TXT = """# Python dependencies
 flask>=2.3.0
 python-dotenv>=1.0.0
 pytest>=7.4.0
 """
-                
-                updated_files.append({
-                    'file_path': 'requirements.txt',
-                    'content': requirements_content,
-                    'component_id': 'build_config',
-                    'story_id': 'initialization',
-                    'file_type': 'config',
-                    'language': 'text',
-                    'auto_generated': True,
-                    'created_at': datetime.utcnow().isoformat()
-                })
-        
-        return updated_files
-        
-    except Exception as e:
-        print(f"Error adding missing build files: {str(e)}")
-        return generated_files  # Return original files if error occurs
\ No newline at end of file
+
+# Build files add_missing_build_files can stub, with the language recorded for each
+_STUB_BUILD_FILE_LANGUAGES = {
+    'package.json': 'json',
+    'requirements.txt': 'text'
+}
+
+
+def _build_stub_file(file_path: str, tech_stack: str) -> Dict[str, Any]:
+    """Generated-file entry holding the minimal stub for one missing build file."""
+    if file_path == 'package.json':
+        content = _stub_package_json(tech_stack.lower())
+    else:
+        content = _STUB_REQUIREMENTS_TXT
+    
+    return {
+        'file_path': file_path,
+        'content': content,
+        'component_id': 'build_config',
+        'story_id': 'initialization',
+        'file_type': 'config',
+        'language': _STUB_BUILD_FILE_LANGUAGES[file_path],
+        'auto_generated': True,
+        'created_at': datetime.utcnow().isoformat()
+    }
\ No newline at end of file
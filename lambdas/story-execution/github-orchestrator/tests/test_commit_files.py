@@ -0,0 +1,71 @@
+"""Tests for GitHubService.commit_files in the deployed handler module."""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import responses
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Import with AWS clients patched; the token is preset so GitHubService never reads Secrets Manager
+with patch('boto3.client'):
+    import lambda_function_original
+
+_REPO_API = 'https://api.github.com/repos/owner/repo'
+
+
+@pytest.fixture
+def github_service():
+    """GitHubService with a cached token."""
+    with patch.object(lambda_function_original, '_GITHUB_TOKEN_CACHE', 'test-token'):
+        yield lambda_function_original.GitHubService()
+
+
+def _request_body(call):
+    return json.loads(call.request.body)
+
+
+@responses.activate
+def test_commit_files_skips_unencodable_file(github_service, capsys):
+    """One bad entry is reported with its batch; the rest of the batch still commits."""
+    responses.put(f'{_REPO_API}/contents/a.txt', status=201,
+                  json={'commit': {'sha': 'new-commit', 'tree': {'sha': 'new-tree'}}})
+
+    result = github_service.commit_files('owner/repo', 'feature', [
+        {'file_path': 'a.txt', 'content': 'hello'},
+        {'file_path': 'b.json', 'content': {'k': 1}}
+    ], 'Add files')
+
+    assert result == {'sha': 'new-commit'}
+    assert [call.request.method for call in responses.calls] == ['PUT']
+    assert 'Failed file b.json' in capsys.readouterr().out
+
+
+@responses.activate
+def test_commit_files_graphql_failure_rereads_branch_head(github_service):
+    """The REST fallback commits on the branch head as it is after the failed mutation."""
+    responses.get(f'{_REPO_API}/git/refs/heads/feature', json={'object': {'sha': 'stale-head'}})
+    responses.get(f'{_REPO_API}/git/refs/heads/feature', json={'object': {'sha': 'moved-head'}})
+    responses.post('https://api.github.com/graphql', status=502)
+    responses.post(f'{_REPO_API}/git/blobs', status=201, json={'sha': 'blob-sha'})
+    responses.get(f'{_REPO_API}/git/commits/moved-head', json={'tree': {'sha': 'base-tree'}})
+    responses.post(f'{_REPO_API}/git/trees', status=201, json={'sha': 'new-tree'})
+    responses.post(f'{_REPO_API}/git/commits', status=201, json={'sha': 'new-commit'})
+    responses.patch(f'{_REPO_API}/git/refs/heads/feature', json={'object': {'sha': 'new-commit'}})
+
+    result = github_service.commit_files('owner/repo', 'feature', [
+        {'file_path': 'a.txt', 'content': 'hello'},
+        {'file_path': 'b.txt', 'content': 'world'}
+    ], 'Add files')
+
+    assert result == {'sha': 'new-commit'}
+    graphql_call = next(call for call in responses.calls if call.request.url.endswith('/graphql'))
+    assert _request_body(graphql_call)['variables']['input']['expectedHeadOid'] == 'stale-head'
+    commit_call = next(call for call in responses.calls
+                       if call.request.method == 'POST' and call.request.url.endswith('/git/commits'))
+    assert _request_body(commit_call)['parents'] == ['moved-head']
+    tree_call = next(call for call in responses.calls if call.request.url.endswith('/git/trees'))
+    assert _request_body(tree_call)['base_tree'] == 'base-tree'
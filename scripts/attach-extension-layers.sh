@@ -0,0 +1,79 @@
+#!/usr/bin/env bash
+
+# Attach the AWS-published extension layers a Lambda lists under "extension_layers"
+# in lambda-deployment-config.json, plus the environment variables each extension needs.
+# Existing layers and environment variables on the function are kept.
+# Usage: ./scripts/attach-extension-layers.sh <lambda-name> <function-name>
+
+set -e
+
+# Colors for output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+NC='\033[0m' # No Color
+
+# Configuration
+LAMBDA_NAME=$1
+FUNCTION_NAME=$2
+AWS_REGION=${AWS_DEFAULT_REGION:-us-east-1}
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+CONFIG_FILE="$PROJECT_ROOT/scripts/lambda-deployment-config.json"
+
+if [ -z "$LAMBDA_NAME" ] || [ -z "$FUNCTION_NAME" ]; then
+    echo -e "${RED}Usage: $0 <lambda-name> <function-name>${NC}"
+    exit 1
+fi
+
+EXTENSIONS=$(jq -r ".lambdas[\"$LAMBDA_NAME\"].extension_layers // [] | .[]" "$CONFIG_FILE")
+if [ -z "$EXTENSIONS" ]; then
+    exit 0
+fi
+
+# --layers and --environment replace the whole list/map, so start from the current configuration
+CURRENT_CONFIG=$(aws lambda get-function-configuration \
+    --function-name "$FUNCTION_NAME" \
+    --region "$AWS_REGION" \
+    --output json)
+ARCHITECTURE=$(echo "$CURRENT_CONFIG" | jq -r '.Architectures[0] // "x86_64"')
+LAYERS=$(echo "$CURRENT_CONFIG" | jq '[.Layers // [] | .[].Arn]')
+ENV_VARS=$(echo "$CURRENT_CONFIG" | jq '.Environment.Variables // {}')
+
+for EXTENSION in $EXTENSIONS; do
+    PUBLISHER_ACCOUNT=$(jq -r ".extension_layers[\"$EXTENSION\"].publisher_account // empty" "$CONFIG_FILE")
+    LAYER_VERSION=$(jq -r ".extension_layers[\"$EXTENSION\"].version // empty" "$CONFIG_FILE")
+    if [ -z "$PUBLISHER_ACCOUNT" ] || [ -z "$LAYER_VERSION" ]; then
+        echo -e "${RED}Extension '$EXTENSION' is not defined under extension_layers in $CONFIG_FILE${NC}"
+        exit 1
+    fi
+
+    # AWS publishes a separate layer name for Graviton functions
+    LAYER_NAME="$EXTENSION"
+    if [ "$ARCHITECTURE" = "arm64" ]; then
+        LAYER_NAME="${EXTENSION}-Arm64"
+    fi
+    LAYER_ARN="arn:aws:lambda:${AWS_REGION}:${PUBLISHER_ACCOUNT}:layer:${LAYER_NAME}:${LAYER_VERSION}"
+    echo -e "${YELLOW}Attaching extension layer: $LAYER_ARN${NC}"
+
+    # Swap out any other version of the same extension rather than stacking two
+    LAYERS=$(echo "$LAYERS" | jq --arg name ":layer:${LAYER_NAME}:" --arg arn "$LAYER_ARN" \
+        '[.[] | select(contains($name) | not)] + [$arn]')
+    ENV_VARS=$(echo "$ENV_VARS" | jq --argjson extension_env \
+        "$(jq ".extension_layers[\"$EXTENSION\"].environment // {}" "$CONFIG_FILE")" \
+        '. + $extension_env')
+done
+
+if aws lambda update-function-configuration \
+    --function-name "$FUNCTION_NAME" \
+    --layers $(echo "$LAYERS" | jq -r '.[]') \
+    --environment "$(jq -n --argjson variables "$ENV_VARS" '{Variables: $variables}')" \
+    --region "$AWS_REGION" > /dev/null; then
+    echo -e "${GREEN}Extension layers attached${NC}"
+else
+    echo -e "${RED}Failed to attach extension layers to $FUNCTION_NAME${NC}"
+    exit 1
+fi
+
+aws lambda wait function-updated \
+    --function-name "$FUNCTION_NAME" \
+    --region "$AWS_REGION"
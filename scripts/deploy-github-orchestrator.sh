@@ -105,6 +105,11 @@ if aws lambda get-function --function-name "$FUNCTION_NAME" --region "$AWS_REGIO
     echo -e "${YELLOW}Waiting for deployment to complete...${NC}"
     aws lambda wait function-updated --function-name "$FUNCTION_NAME" --region "$AWS_REGION"
     
+    # Attach the Parameters and Secrets extension the GitHub/Netlify token reads go through
+    if ! "$PROJECT_ROOT/scripts/attach-extension-layers.sh" "$LAMBDA_NAME" "$FUNCTION_NAME"; then
+        echo -e "${YELLOW}Extension layer attachment failed, but continuing (secrets fall back to Secrets Manager)...${NC}"
+    fi
+    
 else
     echo -e "${RED}Lambda function does not exist!${NC}"
     echo -e "${YELLOW}Please deploy the infrastructure first:${NC}"
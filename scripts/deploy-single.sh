@@ -310,18 +310,35 @@ aws lambda wait function-updated \
     --function-name "$FUNCTION_NAME" \
     --region "$AWS_REGION"
 
-# Update function configuration
-echo -e "${YELLOW}Updating function configuration...${NC}"
+# Update function configuration (per-lambda sizing from config, defaults otherwise)
+LAMBDA_TIMEOUT=900
+LAMBDA_MEMORY=1024
+if [ -f "$CONFIG_FILE" ]; then
+    LAMBDA_TIMEOUT=$(jq -r ".lambdas[\"$LAMBDA_NAME\"].timeout // 900" "$CONFIG_FILE")
+    LAMBDA_MEMORY=$(jq -r ".lambdas[\"$LAMBDA_NAME\"].memory_size // 1024" "$CONFIG_FILE")
+fi
+
+echo -e "${YELLOW}Updating function configuration (timeout ${LAMBDA_TIMEOUT}s, memory ${LAMBDA_MEMORY}MB)...${NC}"
 if aws lambda update-function-configuration \
     --function-name "$FUNCTION_NAME" \
-    --timeout 900 \
-    --memory-size 1024 \
+    --timeout "$LAMBDA_TIMEOUT" \
+    --memory-size "$LAMBDA_MEMORY" \
     --region "$AWS_REGION" > /dev/null 2>&1; then
     echo -e "${GREEN}Function configuration updated successfully${NC}"
 else
     echo -e "${YELLOW}Function configuration update failed, but continuing...${NC}"
 fi
 
+# Attach extension layers (e.g. Parameters and Secrets) listed for this Lambda in the config
+if [ -f "$CONFIG_FILE" ]; then
+    aws lambda wait function-updated \
+        --function-name "$FUNCTION_NAME" \
+        --region "$AWS_REGION"
+    if ! "$PROJECT_ROOT/scripts/attach-extension-layers.sh" "$LAMBDA_NAME" "$FUNCTION_NAME"; then
+        echo -e "${YELLOW}Extension layer attachment failed, but continuing (secrets fall back to Secrets Manager)...${NC}"
+    fi
+fi
+
 # Wait for update to complete
 echo -e "${YELLOW}Waiting for deployment to complete...${NC}"
 aws lambda wait function-updated \